@@ -42,6 +42,11 @@ class LocalOrderBook:
     yes_asks: dict[int, float] = field(default_factory=dict)  # price_cents -> quantity
     last_update: datetime = field(default_factory=datetime.utcnow)
 
+    # Subscription metadata, stable for the life of the subscription
+    title: str = ""
+    game_id: Optional[str] = None
+    volume: float = 0.0
+
     def apply_delta(self, price_cents: int, delta: float, side: str) -> None:
         """Apply a delta to the orderbook.
 
@@ -147,7 +152,11 @@ class LocalOrderBook:
         volume: float = 0.0,
         last_trade_price: Optional[float] = None,
     ) -> MarketPrice:
-        """Convert orderbook state to MarketPrice snapshot."""
+        """Convert orderbook state to MarketPrice snapshot.
+
+        Built through normal pydantic validation: volume, title and game_id
+        come from external market metadata and need coercion and bounds checks.
+        """
         yes_bid = self.best_yes_bid or 0.0
         yes_ask = self.best_yes_ask or 1.0
 
@@ -315,22 +324,37 @@ class BaseWebSocketClient(ABC):
             await self.connect()
 
         # Build and send subscribe message
-        msg = await self._build_subscribe_message(market_ids)
-        await self._ws.send_json(msg)
+        await self._send_subscribe(market_ids)
 
         # Track subscriptions
         self._subscribed_markets.update(market_ids)
 
         # Initialize orderbooks
         for market_id in market_ids:
-            if market_id not in self._orderbooks:
-                self._orderbooks[market_id] = LocalOrderBook(
-                    market_id=market_id,
-                    platform=self.platform,
-                )
+            self._get_or_create_book(market_id)
 
         logger.info(f"{self.platform.value} subscribed to {len(market_ids)} markets")
 
+    async def _send_subscribe(self, market_ids: list[str]) -> None:
+        """Send the subscribe message. Override to customize framing."""
+        msg = await self._build_subscribe_message(market_ids)
+        await self._ws.send_json(msg)
+
+    def _get_or_create_book(self, market_id: str) -> LocalOrderBook:
+        """Get the orderbook for a market, creating it from stored metadata."""
+        book = self._orderbooks.get(market_id)
+        if book is None:
+            meta = self._market_metadata.get(market_id, {})
+            book = LocalOrderBook(
+                market_id=market_id,
+                platform=self.platform,
+                title=meta.get("title", ""),
+                game_id=meta.get("game_id"),
+                volume=meta.get("volume", 0.0),
+            )
+            self._orderbooks[market_id] = book
+        return book
+
     async def unsubscribe(self, market_ids: list[str]) -> None:
         """Unsubscribe from market updates."""
         if not market_ids:
@@ -57,6 +57,12 @@ class PolymarketClient(BaseMarketClient):
         "ncaab": 101952,
     }
 
+    # Shared by every Gamma/CLOB request; per-client auth is layered on in __init__.
+    _DEFAULT_HEADERS: dict[str, str] = {
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+    }
+
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -97,6 +103,11 @@ class PolymarketClient(BaseMarketClient):
 
         self.api_key = api_key or get_polymarket_api_key()
         self.proxy_url = proxy_url
+        self._request_headers = (
+            {**self._DEFAULT_HEADERS, "Authorization": f"Bearer {self.api_key}"}
+            if self.api_key
+            else self._DEFAULT_HEADERS
+        )
         self._token_id_cache: dict[str, Optional[str]] = {}
 
         # EU proxy configuration for regulatory compliance
@@ -119,14 +130,8 @@ class PolymarketClient(BaseMarketClient):
             )
 
     def _get_headers(self) -> dict[str, str]:
-        """Get headers for requests."""
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
-        if self.api_key:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-        return headers
+        """Get headers for requests (a copy callers may safely mutate)."""
+        return dict(self._request_headers)
 
     async def _gamma_request(
         self,
@@ -144,7 +149,7 @@ class PolymarketClient(BaseMarketClient):
             method,
             url,
             params=params,
-            headers=self._get_headers(),
+            headers=self._request_headers,
         ) as response:
             response.raise_for_status()
             return await response.json()
@@ -165,7 +170,7 @@ class PolymarketClient(BaseMarketClient):
             method,
             url,
             params=params,
-            headers=self._get_headers(),
+            headers=self._request_headers,
         ) as response:
             response.raise_for_status()
             return await response.json()
@@ -304,7 +309,7 @@ class PolymarketClient(BaseMarketClient):
                 if refreshed:
                     token_id = self._extract_yes_token_id(refreshed)
             except Exception as e:
-                logger.debug(f"Gamma refresh failed for {condition_id}: {e}")
+                logger.debug("Gamma refresh failed for %s: %s", condition_id, e)
 
         # Fallback: try CLOB API
         if not token_id:
@@ -313,7 +318,7 @@ class PolymarketClient(BaseMarketClient):
                 if clob_market:
                     token_id = self._extract_yes_token_id(clob_market)
             except Exception as e:
-                logger.debug(f"CLOB lookup failed for {condition_id}: {e}")
+                logger.debug("CLOB lookup failed for %s: %s", condition_id, e)
 
         # Cache result (even if None)
         self._token_id_cache[condition_id] = token_id
@@ -469,11 +474,11 @@ class PolymarketClient(BaseMarketClient):
                 }
         except aiohttp.ClientResponseError as e:
             if e.status == 404:
-                logger.debug(f"Market not found in CLOB for condition_id: {condition_id}")
+                logger.debug("Market not found in CLOB for condition_id: %s", condition_id)
             else:
-                logger.debug(f"CLOB API error for {condition_id}: {e}")
+                logger.debug("CLOB API error for %s: %s", condition_id, e)
         except Exception as e:
-            logger.debug(f"Error fetching market from CLOB by condition_id {condition_id}: {e}")
+            logger.debug("Error fetching market from CLOB by condition_id %s: %s", condition_id, e)
 
         # Fallback: search Gamma API (slower, but covers more cases)
         try:
@@ -487,9 +492,9 @@ class PolymarketClient(BaseMarketClient):
                     if market.get("conditionId") == normalized:
                         return market
         except Exception as e:
-            logger.debug(f"Gamma fallback search failed: {e}")
+            logger.debug("Gamma fallback search failed: %s", e)
 
-        logger.debug(f"Market not found for condition_id: {condition_id}")
+        logger.debug("Market not found for condition_id: %s", condition_id)
         return None
 
     async def get_orderbook(self, market_id: str) -> Optional[OrderBook]:
@@ -506,10 +511,10 @@ class PolymarketClient(BaseMarketClient):
                 if resolved:
                     token_id = resolved
                 else:
-                    logger.debug(f"Could not resolve token_id for condition_id: {market_id}")
+                    logger.debug("Could not resolve token_id for condition_id: %s", market_id)
                     return None
             else:
-                logger.debug(f"Market not found for condition_id: {market_id}")
+                logger.debug("Market not found for condition_id: %s", market_id)
                 return None
 
         try:
@@ -541,7 +546,7 @@ class PolymarketClient(BaseMarketClient):
         except aiohttp.ClientResponseError as e:
             if e.status == 404:
                 # AMM markets don't have CLOB orderbooks
-                logger.debug(f"No CLOB orderbook for {market_id} (AMM market)")
+                logger.debug("No CLOB orderbook for %s (AMM market)", market_id)
                 return None
             raise
 
@@ -721,7 +726,7 @@ class PolymarketClient(BaseMarketClient):
                         if len(batch) < BATCH_SIZE or len(tag_markets) >= MAX_FETCH:
                             break
                     
-                    logger.debug(f"DEBUG: Fetched {len(tag_markets)} raw markets for tag {tag}")
+                    logger.debug("DEBUG: Fetched %d raw markets for tag %s", len(tag_markets), tag)
                     all_markets.extend(tag_markets)
                 
                 # Deduplicate markets by ID
@@ -734,7 +739,7 @@ class PolymarketClient(BaseMarketClient):
                         unique_markets.append(m)
                 
                 markets = unique_markets
-                logger.debug(f"DEBUG: Total unique markets fetched: {len(markets)}")
+                logger.debug("DEBUG: Total unique markets fetched: %d", len(markets))
             else:
                 markets = [] # Fallback handled in else block below if I kept it structure
                 # But to preserve logic flow:
@@ -743,13 +748,17 @@ class PolymarketClient(BaseMarketClient):
             if not tags_to_fetch:
                  # Default to fetching valid sports markets if no sport specified
                 markets = await self.get_sports_markets(limit=1000)
-                logger.debug(f"DEBUG: Fetched {len(markets)} raw sports markets")
+                logger.debug("DEBUG: Fetched %d raw sports markets", len(markets))
 
             query_lower = query.lower()
-            return [
-                m for m in markets
-                if query_lower in (m.get("question", "") + m.get("title", "")).lower()
-            ][:limit]
+            matches = []
+            for m in markets:
+                text = (m.get("question", "") + m.get("title", "")).lower()
+                if query_lower in text:
+                    matches.append(m)
+                    if len(matches) >= limit:
+                        break
+            return matches
         except Exception as e:
             logger.error(f"Error searching markets: {e}")
             return []
@@ -12,12 +12,14 @@ Key concepts:
 """
 
 import asyncio
+import contextlib
 import logging
 import time
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 import aiohttp
+import orjson
 
 from arbees_shared.models.market import MarketPrice, Platform
 from markets.base_ws import BaseWebSocketClient, LocalOrderBook
@@ -41,6 +43,7 @@ class PolymarketWebSocketClient(BaseWebSocketClient):
 
     WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
     PING_INTERVAL = 5.0  # Mandatory ping every 5 seconds
+    MAX_PENDING_PRICES = 1000  # Oldest snapshots are dropped (and counted) if the consumer lags
 
     def __init__(self):
         """Initialize Polymarket WebSocket client."""
@@ -53,6 +56,20 @@ class PolymarketWebSocketClient(BaseWebSocketClient):
 
         self._ping_task: Optional[asyncio.Task] = None
 
+        # Handoff from the socket reader task (which mutates books and queues
+        # snapshots) to consumers of next_price()/stream_prices(). None is the
+        # end-of-stream sentinel queued when the reader stops.
+        self._reader: Optional[asyncio.Task] = None
+        self._out_queue: asyncio.Queue[Optional[MarketPrice]] = asyncio.Queue(
+            maxsize=self.MAX_PENDING_PRICES
+        )
+        self._dropped_prices = 0
+
+        # Subscribe frame cache, reused when reconnects resubscribe the same tokens
+        self._cached_subscribe_ids: tuple[str, ...] = ()
+        self._cached_subscribe_msg: Optional[dict] = None
+        self._cached_subscribe_frame: Optional[str] = None
+
     async def connect(self) -> None:
         """Establish WebSocket connection and start ping loop."""
         if self._session is None:
@@ -109,6 +126,97 @@ class PolymarketWebSocketClient(BaseWebSocketClient):
                 logger.warning(f"Polymarket ping error: {e}")
                 break
 
+    def _enqueue(self, item: Optional[MarketPrice]) -> None:
+        """Queue an item for consumers, dropping the oldest snapshot if full."""
+        if self._out_queue.full():
+            self._out_queue.get_nowait()
+            self._dropped_prices += 1
+            if self._dropped_prices == 1 or self._dropped_prices % self.MAX_PENDING_PRICES == 0:
+                logger.warning(
+                    "Polymarket price consumer lagging: dropped %d stale snapshots so far",
+                    self._dropped_prices,
+                )
+        self._out_queue.put_nowait(item)
+
+    def _emit(self, price: MarketPrice) -> MarketPrice:
+        """Queue a price snapshot for consumers (while a stream runs) and return it."""
+        if self._reader is not None and not self._reader.done():
+            self._enqueue(price)
+        return price
+
+    async def _read_socket(self, market_ids: list[str]) -> None:
+        """Drive the base read loop; handlers hand prices off via _emit()."""
+        async for _ in super().stream_prices(market_ids):
+            pass
+
+    async def start_stream(self, market_ids: list[str]) -> None:
+        """Start the background socket reader that feeds next_price().
+
+        Raises:
+            RuntimeError: If a stream is already running
+        """
+        if self._reader is not None and not self._reader.done():
+            raise RuntimeError("Polymarket price stream is already running")
+
+        self._out_queue = asyncio.Queue(maxsize=self.MAX_PENDING_PRICES)
+        self._reader = asyncio.create_task(self._read_socket(market_ids))
+        self._reader.add_done_callback(lambda _: self._enqueue(None))
+
+    async def stop_stream(self) -> None:
+        """Stop the background socket reader, if running."""
+        reader, self._reader = self._reader, None
+        if reader is not None and not reader.done():
+            reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await reader
+
+    async def next_price(self) -> Optional[MarketPrice]:
+        """Return the next queued price update, waiting if none is pending.
+
+        Safe to call from several consumers; each update goes to one of them.
+
+        Returns:
+            The next MarketPrice, or None once the reader has stopped and
+            everything it queued has been consumed
+
+        Raises:
+            RuntimeError: If no stream was started with start_stream()
+            Exception: The reader's failure, once its queued prices are drained
+        """
+        reader = self._reader
+        if reader is None:
+            raise RuntimeError("next_price() requires a running stream; call start_stream() first")
+
+        item = await self._out_queue.get()
+        if item is None:
+            # Leave the sentinel for other consumers and later calls
+            self._out_queue.put_nowait(None)
+            if not reader.cancelled() and reader.exception() is not None:
+                raise reader.exception()
+        return item
+
+    async def stream_prices(
+        self,
+        market_ids: list[str],
+    ) -> AsyncIterator[MarketPrice]:
+        """Stream price updates for markets via WebSocket.
+
+        The socket is read by a background task that only mutates local
+        orderbooks; this generator drains the resulting snapshots, so a burst
+        of book events never waits on the consumer.
+        """
+        await self.start_stream(market_ids)
+        try:
+            while (price := await self.next_price()) is not None:
+                yield price
+        finally:
+            await self.stop_stream()
+
+    @property
+    def dropped_prices(self) -> int:
+        """Snapshots discarded because consumers fell behind."""
+        return self._dropped_prices
+
     async def _authenticate(self) -> dict[str, str]:
         """No authentication required for Polymarket market data."""
         return {}
@@ -124,10 +232,22 @@ class PolymarketWebSocketClient(BaseWebSocketClient):
 
         IMPORTANT: market_ids should be token_ids, not condition_ids.
         """
-        return {
-            "type": "market",
-            "assets_ids": market_ids,
-        }
+        ids = tuple(market_ids)
+        if self._cached_subscribe_msg is None or ids != self._cached_subscribe_ids:
+            self._cached_subscribe_ids = ids
+            self._cached_subscribe_msg = {
+                "type": "market",
+                "assets_ids": list(ids),
+            }
+            self._cached_subscribe_frame = None
+        return self._cached_subscribe_msg
+
+    async def _send_subscribe(self, market_ids: list[str]) -> None:
+        """Send the subscribe frame, encoding it only when the token set changes."""
+        msg = await self._build_subscribe_message(market_ids)
+        if self._cached_subscribe_frame is None:
+            self._cached_subscribe_frame = orjson.dumps(msg).decode()
+        await self._ws.send_str(self._cached_subscribe_frame)
 
     async def _build_unsubscribe_message(self, market_ids: list[str]) -> Optional[dict]:
         """Polymarket doesn't have explicit unsubscribe - just stop listening."""
@@ -141,18 +261,20 @@ class PolymarketWebSocketClient(BaseWebSocketClient):
         - price_change: Price update
         - last_trade_price: Last trade price update
 
+        Every resulting price is queued via _emit(), so each event in a
+        batched array reaches consumers.
+
         Returns:
-            MarketPrice if the message resulted in a price update
+            The last price produced by the message, or None
         """
         # Polymarket wraps data in an array
         if isinstance(msg, list):
-            # Process each event in the array
-            result = None
+            last = None
             for event in msg:
                 price = await self._process_event(event)
-                if price:
-                    result = price
-            return result
+                if price is not None:
+                    last = price
+            return last
 
         return await self._process_event(msg)
 
@@ -168,10 +290,10 @@ class PolymarketWebSocketClient(BaseWebSocketClient):
             return await self._handle_last_trade(event)
         elif event_type == "tick_size_change":
             # Ignore tick size changes
-            return None
+            pass
         else:
-            logger.debug(f"Unknown Polymarket event: {event_type}")
-            return None
+            logger.debug("Unknown Polymarket event: %s", event_type)
+        return None
 
     async def _handle_book(self, event: dict) -> Optional[MarketPrice]:
         """Handle book snapshot event.
@@ -218,14 +340,7 @@ class PolymarketWebSocketClient(BaseWebSocketClient):
             except (ValueError, TypeError):
                 continue
 
-        # Get or create orderbook
-        if token_id not in self._orderbooks:
-            self._orderbooks[token_id] = LocalOrderBook(
-                market_id=token_id,
-                platform=Platform.POLYMARKET,
-            )
-
-        book = self._orderbooks[token_id]
+        book = self._get_or_create_book(token_id)
 
         # For Polymarket, asks are direct YES asks, not NO bids
         # So we need to handle this differently
@@ -249,18 +364,20 @@ class PolymarketWebSocketClient(BaseWebSocketClient):
 
         book.last_update = datetime.utcnow()
 
-        logger.debug(
-            f"Polymarket book {token_id[:16]}...: "
-            f"bid={0.0 if not book.best_yes_bid else book.best_yes_bid:.2f}, "
-            f"ask={1.0 if not book.best_yes_ask else book.best_yes_ask:.2f}"
-        )
+        # Guarded: computing best bid/ask walks the book
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Polymarket book %s...: bid=%.2f, ask=%.2f",
+                token_id[:16],
+                book.best_yes_bid or 0.0,
+                book.best_yes_ask or 1.0,
+            )
 
-        meta = self._market_metadata.get(token_id, {})
-        return book.to_market_price(
-            market_title=meta.get("title", ""),
-            game_id=meta.get("game_id"),
-            volume=meta.get("volume", 0.0),
-        )
+        return self._emit(book.to_market_price(
+            market_title=book.title,
+            game_id=book.game_id,
+            volume=book.volume,
+        ))
 
     async def _handle_price_change(self, event: dict) -> Optional[MarketPrice]:
         """Handle price change event.
@@ -278,14 +395,7 @@ class PolymarketWebSocketClient(BaseWebSocketClient):
         if not token_id:
             return None
 
-        book = self._orderbooks.get(token_id)
-        if not book:
-            # Create new orderbook
-            book = LocalOrderBook(
-                market_id=token_id,
-                platform=Platform.POLYMARKET,
-            )
-            self._orderbooks[token_id] = book
+        book = self._get_or_create_book(token_id)
 
         try:
             price = float(event.get("price", 0))
@@ -313,12 +423,11 @@ class PolymarketWebSocketClient(BaseWebSocketClient):
             logger.warning(f"Error parsing price change: {e}")
             return None
 
-        meta = self._market_metadata.get(token_id, {})
-        return book.to_market_price(
-            market_title=meta.get("title", ""),
-            game_id=meta.get("game_id"),
-            volume=meta.get("volume", 0.0),
-        )
+        return self._emit(book.to_market_price(
+            market_title=book.title,
+            game_id=book.game_id,
+            volume=book.volume,
+        ))
 
     async def _handle_last_trade(self, event: dict) -> Optional[MarketPrice]:
         """Handle last trade price event.
@@ -334,29 +443,26 @@ class PolymarketWebSocketClient(BaseWebSocketClient):
         if not token_id:
             return None
 
+        book = self._orderbooks.get(token_id)
+
         try:
             price = float(event.get("price", 0))
-
-            # Update metadata with last trade price
-            if token_id not in self._market_metadata:
-                self._market_metadata[token_id] = {}
-            self._market_metadata[token_id]["last_trade_price"] = price
-
-            # Get orderbook if exists
-            book = self._orderbooks.get(token_id)
-            if book:
-                meta = self._market_metadata.get(token_id, {})
-                return book.to_market_price(
-                    market_title=meta.get("title", ""),
-                    game_id=meta.get("game_id"),
-                    volume=meta.get("volume", 0.0),
-                    last_trade_price=price,
-                )
-
         except (ValueError, TypeError) as e:
             logger.warning(f"Error parsing last trade: {e}")
+            return None
 
-        return None
+        # Remember the last trade even before a book exists (early-subscription
+        # races, dormant tokens) so later snapshots can report it
+        self._market_metadata.setdefault(token_id, {})["last_trade_price"] = price
+        if book is None:
+            return None
+
+        return self._emit(book.to_market_price(
+            market_title=book.title,
+            game_id=book.game_id,
+            volume=book.volume,
+            last_trade_price=price,
+        ))
 
     async def set_market_metadata(
         self,
@@ -381,6 +487,12 @@ class PolymarketWebSocketClient(BaseWebSocketClient):
             **kwargs,
         }
 
+        book = self._orderbooks.get(token_id)
+        if book is not None:
+            book.title = title
+            book.game_id = game_id
+            book.volume = kwargs.get("volume", 0.0)
+
     async def subscribe_with_metadata(
         self,
         markets: list[dict],
@@ -401,6 +513,11 @@ class PolymarketWebSocketClient(BaseWebSocketClient):
                     "condition_id": m.get("condition_id"),
                     "volume": m.get("volume", 0.0),
                 }
+                # Pre-create the book so handlers read metadata off it directly
+                book = self._get_or_create_book(token_id)
+                book.title = m.get("title", "")
+                book.game_id = m.get("game_id")
+                book.volume = m.get("volume", 0.0)
 
         await self.subscribe(token_ids)
 
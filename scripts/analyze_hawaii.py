@@ -2,6 +2,7 @@
 """Analyze the Hawaii game trades specifically."""
 
 import asyncio
+import sys
 from datetime import date
 from dotenv import load_dotenv
 load_dotenv()
@@ -26,6 +27,7 @@ async def main():
           f'{"Edge":>6} {"Kelly":>5} | {"PnL":>10} | {"Outcome":<6}')
     print('-'*150)
 
+    lines = []
     running_pnl = 0
     for t in trades:
         entry = float(t['entry_price'])
@@ -37,9 +39,11 @@ async def main():
         running_pnl += pnl
 
         time_str = t['entry_time'].strftime('%H:%M:%S') if t['entry_time'] else ''
-        print(f'{time_str:<20} | {t["side"]:4} | {entry:>6.3f} {exit_p:>6.3f} | '
-              f'${size:>10,.2f} | {edge:>5.1f}% {kelly:>5.2f} | '
-              f'${pnl:>9,.2f} | {t["outcome"] or "open":<6} (running: ${running_pnl:,.2f})')
+        lines.append(f'{time_str:<20} | {t["side"]:4} | {entry:>6.3f} {exit_p:>6.3f} | '
+                     f'${size:>10,.2f} | {edge:>5.1f}% {kelly:>5.2f} | '
+                     f'${pnl:>9,.2f} | {t["outcome"] or "open":<6} (running: ${running_pnl:,.2f})')
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
 
     print('-'*150)
     print(f'Total PnL: ${running_pnl:,.2f}')
@@ -2,6 +2,7 @@
 """Analyze today's suspicious trading data."""
 
 import asyncio
+import heapq
 from datetime import date
 from collections import Counter
 from dotenv import load_dotenv
@@ -17,12 +18,36 @@ async def analyze_today():
     print(f'DETAILED ANALYSIS FOR {today}')
     print('='*100)
 
-    # Get all trades
-    trades = await pool.fetch("""
-        SELECT * FROM paper_trades
-        WHERE DATE(entry_time) = $1 OR DATE(exit_time) = $1
-        ORDER BY entry_time
-    """, today)
+    # Trades (with their expected PnL computed by Postgres) and the per-game
+    # rollup are independent, so both queries run concurrently on the pool
+    trades, games = await asyncio.gather(
+        pool.fetch("""
+            SELECT
+                trade_id, side, entry_price, exit_price, size, pnl, market_title,
+                CASE WHEN side = 'buy'
+                    THEN (COALESCE(exit_price, 0) - entry_price) * size
+                    ELSE (entry_price - COALESCE(exit_price, 0)) * size
+                END AS expected_pnl
+            FROM paper_trades
+            WHERE DATE(entry_time) = $1 OR DATE(exit_time) = $1
+            ORDER BY entry_time
+        """, today),
+        pool.fetch("""
+            SELECT
+                game_id,
+                market_title,
+                COUNT(*) as trades,
+                SUM(size) as volume,
+                SUM(pnl) as pnl,
+                SUM(CASE WHEN outcome = 'win' THEN 1 ELSE 0 END) as wins,
+                SUM(CASE WHEN outcome = 'loss' THEN 1 ELSE 0 END) as losses
+            FROM paper_trades
+            WHERE DATE(entry_time) = $1 OR DATE(exit_time) = $1
+            GROUP BY game_id, market_title
+            ORDER BY volume DESC
+            LIMIT 20
+        """, today),
+    )
 
     print(f'Total trades: {len(trades)}')
 
@@ -32,25 +57,14 @@ async def analyze_today():
     print('-'*100)
 
     wrong_count = 0
-    for t in list(trades)[:50]:
-        entry = float(t['entry_price'])
-        exit_p = float(t['exit_price']) if t['exit_price'] else 0
-        size = float(t['size'])
-        recorded_pnl = float(t['pnl'] or 0)
-        side = t['side']
-
-        # Expected PnL
-        if side == 'buy':
-            expected_pnl = (exit_p - entry) * size
-        else:  # sell
-            expected_pnl = (entry - exit_p) * size
-
-        diff = abs(recorded_pnl - expected_pnl)
+    for t in trades[:50]:
+        diff = abs((t['pnl'] or 0) - t['expected_pnl'])
         if diff > 0.01:
             wrong_count += 1
-            print(f'{t["trade_id"][:8]} {str(side):4} entry={entry:.3f} exit={exit_p:.3f} '
-                  f'size=${size:.2f} recorded=${recorded_pnl:+.2f} expected=${expected_pnl:+.2f} '
-                  f'DIFF=${diff:.2f}')
+            print(f'{t["trade_id"][:8]} {str(t["side"]):4} entry={float(t["entry_price"]):.3f} '
+                  f'exit={float(t["exit_price"] or 0):.3f} size=${float(t["size"]):.2f} '
+                  f'recorded=${float(t["pnl"] or 0):+.2f} expected=${float(t["expected_pnl"]):+.2f} '
+                  f'DIFF=${float(diff):.2f}')
 
     print(f'\nWrong PnL calculations: {wrong_count} out of {min(len(trades), 50)} checked')
 
@@ -66,8 +80,7 @@ async def analyze_today():
 
     # Look at the biggest positions
     print('\nLargest positions:')
-    sorted_by_size = sorted(trades, key=lambda x: float(x['size']), reverse=True)
-    for t in sorted_by_size[:10]:
+    for t in heapq.nlargest(10, trades, key=lambda x: x['size']):
         print(f'  ${float(t["size"]):.2f} - {t["market_title"][:60]}')
 
     # Check if there are duplicate trades
@@ -75,12 +88,11 @@ async def analyze_today():
     print('CHECKING FOR DUPLICATES:')
     print('-'*100)
 
-    trade_ids = [t['trade_id'] for t in trades]
-    unique_ids = set(trade_ids)
-    print(f'Total trades: {len(trade_ids)}, Unique IDs: {len(unique_ids)}')
-    if len(trade_ids) != len(unique_ids):
+    id_counts = Counter(t['trade_id'] for t in trades)
+    print(f'Total trades: {len(trades)}, Unique IDs: {len(id_counts)}')
+    if len(trades) != len(id_counts):
         print('[!] DUPLICATE TRADE IDS FOUND!')
-        dupes = [tid for tid, cnt in Counter(trade_ids).items() if cnt > 1]
+        dupes = [tid for tid, cnt in id_counts.items() if cnt > 1]
         for d in dupes[:10]:
             print(f'  Duplicate: {d}')
 
@@ -89,22 +101,6 @@ async def analyze_today():
     print('TRADES PER GAME:')
     print('-'*100)
 
-    games = await pool.fetch("""
-        SELECT
-            game_id,
-            market_title,
-            COUNT(*) as trades,
-            SUM(size) as volume,
-            SUM(pnl) as pnl,
-            SUM(CASE WHEN outcome = 'win' THEN 1 ELSE 0 END) as wins,
-            SUM(CASE WHEN outcome = 'loss' THEN 1 ELSE 0 END) as losses
-        FROM paper_trades
-        WHERE DATE(entry_time) = $1 OR DATE(exit_time) = $1
-        GROUP BY game_id, market_title
-        ORDER BY volume DESC
-        LIMIT 20
-    """, today)
-
     for g in games:
         total = (g['wins'] or 0) + (g['losses'] or 0)
         wr = (g['wins'] / total * 100) if total > 0 else 0
@@ -117,16 +113,33 @@ async def analyze_today():
     print('ENTRY PRICE DISTRIBUTION:')
     print('-'*100)
 
-    entry_prices = [float(t['entry_price']) for t in trades]
-    exit_prices = [float(t['exit_price']) for t in trades if t['exit_price']]
-
-    print(f'Entry prices - Min: {min(entry_prices):.3f}, Max: {max(entry_prices):.3f}, Avg: {sum(entry_prices)/len(entry_prices):.3f}')
-    if exit_prices:
-        print(f'Exit prices  - Min: {min(exit_prices):.3f}, Max: {max(exit_prices):.3f}, Avg: {sum(exit_prices)/len(exit_prices):.3f}')
+    # Single pass over the trades for the price stats and settlement counts
+    entry_min = exit_min = float('inf')
+    entry_max = exit_max = float('-inf')
+    entry_sum = exit_sum = 0.0
+    exit_count = 0
+    perfect_wins = []
+    perfect_losses = []
+    for t in trades:
+        entry = float(t['entry_price'])
+        entry_min = min(entry_min, entry)
+        entry_max = max(entry_max, entry)
+        entry_sum += entry
+        if t['exit_price']:
+            exit_p = float(t['exit_price'])
+            exit_min = min(exit_min, exit_p)
+            exit_max = max(exit_max, exit_p)
+            exit_sum += exit_p
+            exit_count += 1
+            if exit_p == 1.0:
+                perfect_wins.append(t)
+            elif exit_p == 0.0:
+                perfect_losses.append(t)
+
+    print(f'Entry prices - Min: {entry_min:.3f}, Max: {entry_max:.3f}, Avg: {entry_sum/len(trades):.3f}')
+    if exit_count:
+        print(f'Exit prices  - Min: {exit_min:.3f}, Max: {exit_max:.3f}, Avg: {exit_sum/exit_count:.3f}')
 
-    # Check for 1.0 or 0.0 settlements
-    perfect_wins = [t for t in trades if t['exit_price'] and float(t['exit_price']) == 1.0]
-    perfect_losses = [t for t in trades if t['exit_price'] and float(t['exit_price']) == 0.0]
     print(f'\nPerfect settlement wins (exit=1.0): {len(perfect_wins)}')
     print(f'Perfect settlement losses (exit=0.0): {len(perfect_losses)}')
 
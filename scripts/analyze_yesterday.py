@@ -19,11 +19,8 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
-async def query_raw_trades():
+async def query_raw_trades(pool):
     """Query raw trade data from database."""
-    from arbees_shared.db.connection import get_pool, close_pool
-
-    pool = await get_pool()
     yesterday = date.today() - timedelta(days=1)
 
     print("\n" + "="*80)
@@ -34,10 +31,20 @@ async def query_raw_trades():
     trades = await pool.fetch("""
         SELECT
             trade_id, game_id, sport, side,
-            entry_price, exit_price, size,
+            entry_price::float8 AS entry_price,
+            exit_price::float8 AS exit_price,
+            size::float8 AS size,
             entry_time, exit_time,
-            status, outcome, pnl, pnl_pct,
-            model_prob, edge_at_entry, market_title
+            status, outcome,
+            pnl::float8 AS pnl,
+            pnl_pct::float8 AS pnl_pct,
+            model_prob::float8 AS model_prob,
+            edge_at_entry::float8 AS edge_at_entry,
+            market_title,
+            (CASE WHEN side = 'buy'
+                THEN (COALESCE(exit_price, 0) - entry_price) * size
+                ELSE (entry_price - COALESCE(exit_price, 0)) * size
+            END)::float8 AS expected_pnl
         FROM paper_trades
         WHERE DATE(entry_time) = $1 OR DATE(exit_time) = $1
         ORDER BY entry_time ASC
@@ -62,8 +69,8 @@ async def query_raw_trades():
     print(f"\nTotal trades found: {len(trades)}")
 
     # Calculate summary stats
-    total_volume = sum(float(t['size']) for t in trades)
-    total_pnl = sum(float(t['pnl'] or 0) for t in trades if t['pnl'] is not None)
+    total_volume = sum(t['size'] for t in trades)
+    total_pnl = sum(t['pnl'] for t in trades if t['pnl'] is not None)
 
     closed_trades = [t for t in trades if t['status'] == 'closed']
     wins = sum(1 for t in closed_trades if t['outcome'] == 'win')
@@ -84,7 +91,7 @@ async def query_raw_trades():
     print("-"*80)
 
     # 1. Check for very large position sizes
-    large_positions = [t for t in trades if float(t['size']) > 100]
+    large_positions = [t for t in trades if t['size'] > 100]
     if large_positions:
         print(f"\n[!] Large positions (>$100):")
         for t in large_positions[:10]:
@@ -95,8 +102,7 @@ async def query_raw_trades():
     # 2. Check for weird entry/exit prices
     weird_prices = []
     for t in trades:
-        entry = float(t['entry_price'])
-        exit_p = float(t['exit_price']) if t['exit_price'] is not None else None
+        entry, exit_p = t['entry_price'], t['exit_price']
         if entry <= 0 or entry >= 1:
             weird_prices.append(('entry', t, entry))
         if exit_p is not None and (exit_p < 0 or exit_p > 1):
@@ -113,23 +119,14 @@ async def query_raw_trades():
     print("-"*80)
 
     for t in closed_trades[:20]:
-        entry = float(t['entry_price'])
-        exit_p = float(t['exit_price']) if t['exit_price'] else 0
-        size = float(t['size'])
-        recorded_pnl = float(t['pnl'] or 0)
-        side = t['side']
-
-        # Expected PnL calculation
-        if side == 'buy':
-            expected_pnl = (exit_p - entry) * size
-        else:  # sell
-            expected_pnl = (entry - exit_p) * size
-
+        recorded_pnl = t['pnl'] or 0
+        expected_pnl = t['expected_pnl']
         diff = abs(recorded_pnl - expected_pnl)
         status = "[OK]" if diff < 0.01 else f"[!] DIFF={diff:.2f}"
 
-        print(f"  {t['trade_id'][:8]}... {side:4} entry={entry:.3f} exit={exit_p:.3f} "
-              f"size=${size:.2f} pnl=${recorded_pnl:+.2f} expected=${expected_pnl:+.2f} {status}")
+        print(f"  {t['trade_id'][:8]}... {t['side']:4} entry={t['entry_price']:.3f} "
+              f"exit={t['exit_price'] or 0:.3f} size=${t['size']:.2f} "
+              f"pnl=${recorded_pnl:+.2f} expected=${expected_pnl:+.2f} {status}")
 
     # 4. Group by sport
     print("\n" + "-"*80)
@@ -162,13 +159,14 @@ async def query_raw_trades():
     print("POSITION SIZE ANALYSIS:")
     print("-"*80)
 
-    sizes = [float(t['size']) for t in trades]
-    edges = [float(t['edge_at_entry'] or 0) for t in trades if t['edge_at_entry']]
+    # Stats from the rows already fetched; the median is a real row, as before
+    sizes = sorted(t['size'] for t in trades)
+    edges = [t['edge_at_entry'] for t in trades if t['edge_at_entry']]
 
-    print(f"  Min size: ${min(sizes):.2f}")
-    print(f"  Max size: ${max(sizes):.2f}")
-    print(f"  Avg size: ${sum(sizes)/len(sizes):.2f}")
-    print(f"  Median size: ${sorted(sizes)[len(sizes)//2]:.2f}")
+    print(f"  Min size: ${sizes[0]:.2f}")
+    print(f"  Max size: ${sizes[-1]:.2f}")
+    print(f"  Avg size: ${total_volume/len(sizes):.2f}")
+    print(f"  Median size: ${sizes[len(sizes)//2]:.2f}")
     if edges:
         print(f"  Avg edge: {sum(edges)/len(edges):.2f}%")
 
@@ -181,17 +179,14 @@ async def query_raw_trades():
     print(f"  Max position %: {max_pct}%")
     print(f"  Expected max size: ${expected_max:.2f}")
 
-    oversized = [t for t in trades if float(t['size']) > expected_max * 1.1]
+    oversized = [t for t in trades if t['size'] > expected_max * 1.1]
     if oversized:
         print(f"\n  [!] {len(oversized)} trades exceeded max position size!")
 
-    await close_pool()
-
 
 async def run_ml_analysis():
     """Run the ML analyzer on yesterday's data."""
     from services.ml_analyzer import MLAnalyzer
-    from arbees_shared.db.connection import close_pool
 
     yesterday = date.today() - timedelta(days=1)
 
@@ -229,15 +224,20 @@ async def run_ml_analysis():
 
     except Exception as e:
         logger.error(f"ML Analysis failed: {e}", exc_info=True)
-    finally:
-        await close_pool()
 
 
 async def main():
-    """Run both analyses."""
-    await query_raw_trades()
-    print("\n\n")
-    await run_ml_analysis()
+    """Run both analyses on one shared connection pool."""
+    from arbees_shared.db.connection import get_pool, close_pool
+
+    pool = await get_pool()
+    try:
+        await query_raw_trades(pool)
+        print("\n\n")
+        # MLAnalyzer reuses the same pool through get_pool()
+        await run_ml_analysis()
+    finally:
+        await close_pool()
 
 
 if __name__ == "__main__":
@@ -23,10 +23,14 @@ import argparse
 import asyncio
 import logging
 import os
+import random
 import sys
-from dataclasses import dataclass
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
 from typing import Optional
 
+import orjson
+
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -37,8 +41,37 @@ from markets.polymarket.config import get_polymarket_gamma_url, get_polymarket_c
 
 logger = logging.getLogger(__name__)
 
+# Optional uvloop event loop; falls back to the default asyncio loop
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# Section (test method) the current task is writing output for
+_current_section: ContextVar[str] = ContextVar("smoke_test_section", default="")
+
+# Per-section and whole-run time limits so a hung endpoint can't stall CI
+REST_TEST_TIMEOUT_S = 15.0
+WS_TEST_TIMEOUT_S = 20.0
+TOTAL_TIMEOUT_S = 60.0
+
+
+async def _retry_connect(client, attempts: int = 3, base: float = 0.5, timeout: float = 5.0) -> None:
+    """Connect a WebSocket client, retrying transient failures with jittered backoff."""
+    for attempt in range(attempts):
+        try:
+            await asyncio.wait_for(client.connect(), timeout=timeout)
+            return
+        except Exception as e:
+            if attempt == attempts - 1:
+                raise
+            delay = base * 2 ** attempt + random.random() * 0.1
+            logger.debug(f"WebSocket connect attempt {attempt + 1} failed ({e}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TestResult:
     """Result of a single smoke test."""
     name: str
@@ -50,98 +83,212 @@ class TestResult:
 class SmokeTestRunner:
     """Runner for API smoke tests."""
     
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, json_output: bool = False):
         self.verbose = verbose
+        # In JSON mode results are only reported as one JSON document at the end
+        self.json_output = json_output
+        # Endpoint config resolved once per run
+        self.kalshi_env = get_kalshi_environment()
+        self.urls = {
+            "kalshi_rest": get_kalshi_rest_url(self.kalshi_env),
+            "kalshi_ws": get_kalshi_ws_url(self.kalshi_env),
+            "polymarket_gamma": get_polymarket_gamma_url(),
+            "polymarket_clob": get_polymarket_clob_url(),
+            "polymarket_ws": get_polymarket_ws_url(),
+        }
         self.results: list[TestResult] = []
+        # Tests run concurrently, so output and results are buffered per
+        # section and flushed in a fixed order once all of them finish
+        self._output: dict[str, list[str]] = {}
+        self._section_results: dict[str, list[TestResult]] = {}
+        # REST clients (and their HTTP sessions) are shared for the whole run
+        # and closed once in __aexit__
+        self._rest_clients: dict[str, object] = {}
+        # Health check result per platform; the warm-up's check is reused by
+        # the REST tests instead of being repeated
+        self._health: dict[str, bool] = {}
+    
+    async def __aenter__(self) -> "SmokeTestRunner":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await asyncio.gather(
+            *(client.disconnect() for client in self._rest_clients.values()),
+            return_exceptions=True,
+        )
+        self._rest_clients.clear()
+    
+    async def warm_up(self, kalshi: bool, polymarket: bool, timeout: float = 5.0) -> None:
+        """Open TCP/TLS connections to the REST hosts before the timed tests.
+        
+        Runs each platform's health check, whose result the REST tests reuse.
+        Best effort: any failure here is left for the real tests to report.
+        """
+        async def check(name: str, factory) -> None:
+            client = await self._rest_client(name, factory)
+            await self._health_check(name, client)
+        
+        warmups = []
+        if kalshi:
+            warmups.append(check("kalshi", KalshiClient))
+        if polymarket:
+            warmups.append(check("polymarket", PolymarketClient))
+        try:
+            async with asyncio.timeout(timeout):
+                await asyncio.gather(*warmups, return_exceptions=True)
+        except TimeoutError:
+            pass
+    
+    async def _rest_client(self, name: str, factory):
+        """Get the shared, connected REST client for a platform."""
+        client = self._rest_clients.get(name)
+        if client is None:
+            client = factory()
+            await client.connect()
+            self._rest_clients[name] = client
+        return client
+    
+    async def _health_check(self, name: str, client) -> bool:
+        """Run a platform's health check once per run and reuse the result."""
+        if name not in self._health:
+            self._health[name] = await client.health_check()
+        return self._health[name]
+    
+    def emit(self, line: str) -> None:
+        """Buffer an output line for the current section."""
+        if self.json_output:
+            return
+        self._output.setdefault(_current_section.get(), []).append(line)
     
     def log(self, msg: str) -> None:
         """Log a message if verbose mode is enabled."""
         if self.verbose:
-            print(f"  {msg}")
+            self.emit(f"  {msg}")
     
     def add_result(self, result: TestResult) -> None:
         """Add a test result."""
-        self.results.append(result)
+        self._section_results.setdefault(_current_section.get(), []).append(result)
         status = "✓" if result.success else "✗"
-        print(f"  {status} {result.name}: {result.message}")
+        self.emit(f"  {status} {result.name}: {result.message}")
         if result.details and self.verbose:
-            print(f"    Details: {result.details}")
+            self.emit(f"    Details: {result.details}")
+    
+    async def _run_section(self, name: str, test, timeout: float) -> None:
+        """Run one test method, capped at timeout, with its output routed to its own section."""
+        _current_section.set(name)
+        try:
+            async with asyncio.timeout(timeout):
+                await test()
+        except TimeoutError:
+            self.add_result(TestResult(
+                name=name,
+                success=False,
+                message=f"Timed out after {timeout:.0f}s",
+            ))
+        except Exception as e:
+            self.add_result(TestResult(
+                name=name,
+                success=False,
+                message=f"Failed: {e}",
+            ))
+    
+    async def run(self, tests: list[tuple], total_timeout: float = 60.0) -> None:
+        """Run (test method, timeout) pairs concurrently, then print their output in order."""
+        names = [test.__name__ for test, _ in tests]
+        try:
+            async with asyncio.timeout(total_timeout):
+                async with asyncio.TaskGroup() as tg:
+                    for name, (test, timeout) in zip(names, tests, strict=True):
+                        tg.create_task(self._run_section(name, test, timeout))
+        except TimeoutError:
+            _current_section.set("")
+            self.add_result(TestResult(
+                name="Smoke Tests",
+                success=False,
+                message=f"Run exceeded {total_timeout:.0f}s",
+            ))
+            names.append("")
+        for name in names:
+            for line in self._output.get(name, []):
+                print(line)
+            self.results.extend(self._section_results.get(name, []))
     
     async def test_kalshi_rest(self) -> None:
         """Test Kalshi REST API connectivity."""
-        env = get_kalshi_environment()
-        base_url = get_kalshi_rest_url()
+        env = self.kalshi_env
+        base_url = self.urls["kalshi_rest"]
         
-        print(f"\nKalshi REST API ({env.value})")
-        print(f"  URL: {base_url}")
+        self.emit(f"\nKalshi REST API ({env.value})")
+        self.emit(f"  URL: {base_url}")
         
-        client = KalshiClient()
-        try:
-            await client.connect()
-            
-            # Test 1: Health check / exchange status
-            try:
-                healthy = await client.health_check()
-                self.add_result(TestResult(
-                    name="Health Check",
-                    success=healthy,
-                    message="API responding" if healthy else "API not responding",
-                ))
-            except Exception as e:
-                self.add_result(TestResult(
-                    name="Health Check",
-                    success=False,
-                    message=f"Failed: {e}",
-                ))
-            
-            # Test 2: Fetch markets
+        client = await self._rest_client("kalshi", KalshiClient)
+        
+        # Tests 1 and 2 are independent requests - issue them together
+        healthy, markets = await asyncio.gather(
+            self._health_check("kalshi", client),
+            client.get_markets(limit=5),
+            return_exceptions=True,
+        )
+        
+        # Test 1: Health check / exchange status
+        if isinstance(healthy, Exception):
+            self.add_result(TestResult(
+                name="Health Check",
+                success=False,
+                message=f"Failed: {healthy}",
+            ))
+        else:
+            self.add_result(TestResult(
+                name="Health Check",
+                success=healthy,
+                message="API responding" if healthy else "API not responding",
+            ))
+        
+        # Test 2: Fetch markets
+        if isinstance(markets, Exception):
+            self.add_result(TestResult(
+                name="Get Markets",
+                success=False,
+                message=f"Failed: {markets}",
+            ))
+            markets = []
+        else:
+            self.add_result(TestResult(
+                name="Get Markets",
+                success=len(markets) > 0,
+                message=f"Found {len(markets)} markets",
+                details=f"First market: {markets[0].get('ticker') if markets else 'N/A'}",
+            ))
+        
+        # Test 3: Fetch orderbook (if we got markets)
+        if markets:
             try:
-                markets = await client.get_markets(limit=5)
-                self.add_result(TestResult(
-                    name="Get Markets",
-                    success=len(markets) > 0,
-                    message=f"Found {len(markets)} markets",
-                    details=f"First market: {markets[0].get('ticker') if markets else 'N/A'}",
-                ))
+                ticker = markets[0].get("ticker")
+                if ticker:
+                    orderbook = await client.get_orderbook(ticker)
+                    has_depth = orderbook and (orderbook.yes_bids or orderbook.yes_asks)
+                    self.add_result(TestResult(
+                        name="Get Orderbook",
+                        success=orderbook is not None,
+                        message=f"Orderbook for {ticker}" + (" (has depth)" if has_depth else " (empty)"),
+                        details=f"Bids: {len(orderbook.yes_bids) if orderbook else 0}, Asks: {len(orderbook.yes_asks) if orderbook else 0}",
+                    ))
             except Exception as e:
                 self.add_result(TestResult(
-                    name="Get Markets",
+                    name="Get Orderbook",
                     success=False,
                     message=f"Failed: {e}",
                 ))
-            
-            # Test 3: Fetch orderbook (if we got markets)
-            if markets:
-                try:
-                    ticker = markets[0].get("ticker")
-                    if ticker:
-                        orderbook = await client.get_orderbook(ticker)
-                        has_depth = orderbook and (orderbook.yes_bids or orderbook.yes_asks)
-                        self.add_result(TestResult(
-                            name="Get Orderbook",
-                            success=orderbook is not None,
-                            message=f"Orderbook for {ticker}" + (" (has depth)" if has_depth else " (empty)"),
-                            details=f"Bids: {len(orderbook.yes_bids) if orderbook else 0}, Asks: {len(orderbook.yes_asks) if orderbook else 0}",
-                        ))
-                except Exception as e:
-                    self.add_result(TestResult(
-                        name="Get Orderbook",
-                        success=False,
-                        message=f"Failed: {e}",
-                    ))
-            
-        finally:
-            await client.disconnect()
     
     async def test_kalshi_ws(self) -> None:
         """Test Kalshi WebSocket connectivity (brief connection only)."""
         from markets.kalshi.websocket.ws_client import KalshiWebSocketClient
         
-        env = get_kalshi_environment()
-        ws_url = get_kalshi_ws_url()
+        env = self.kalshi_env
+        ws_url = self.urls["kalshi_ws"]
         
-        print(f"\nKalshi WebSocket ({env.value})")
-        print(f"  URL: {ws_url}")
+        self.emit(f"\nKalshi WebSocket ({env.value})")
+        self.emit(f"  URL: {ws_url}")
         
         # Check if we have credentials for WS auth
         api_key = os.environ.get("KALSHI_API_KEY", "")
@@ -168,7 +315,7 @@ class SmokeTestRunner:
         
         client = KalshiWebSocketClient()
         try:
-            await client.connect()
+            await _retry_connect(client)
             self.add_result(TestResult(
                 name="WebSocket Connect",
                 success=client.is_connected,
@@ -202,84 +349,84 @@ class SmokeTestRunner:
     
     async def test_polymarket_rest(self) -> None:
         """Test Polymarket REST API connectivity (Gamma + CLOB)."""
-        gamma_url = get_polymarket_gamma_url()
-        clob_url = get_polymarket_clob_url()
+        gamma_url = self.urls["polymarket_gamma"]
+        clob_url = self.urls["polymarket_clob"]
         
-        print(f"\nPolymarket REST API")
-        print(f"  Gamma URL: {gamma_url}")
-        print(f"  CLOB URL: {clob_url}")
+        self.emit(f"\nPolymarket REST API")
+        self.emit(f"  Gamma URL: {gamma_url}")
+        self.emit(f"  CLOB URL: {clob_url}")
         
-        client = PolymarketClient()
-        try:
-            await client.connect()
-            
-            # Test 1: Health check
-            try:
-                healthy = await client.health_check()
-                self.add_result(TestResult(
-                    name="Health Check (Gamma)",
-                    success=healthy,
-                    message="Gamma API responding" if healthy else "Gamma API not responding",
-                ))
-            except Exception as e:
-                self.add_result(TestResult(
-                    name="Health Check (Gamma)",
-                    success=False,
-                    message=f"Failed: {e}",
-                ))
-            
-            # Test 2: Fetch markets (Gamma)
+        client = await self._rest_client("polymarket", PolymarketClient)
+        
+        # Tests 1 and 2 are independent requests - issue them together
+        healthy, markets = await asyncio.gather(
+            self._health_check("polymarket", client),
+            client.get_markets(limit=5),
+            return_exceptions=True,
+        )
+        
+        # Test 1: Health check
+        if isinstance(healthy, Exception):
+            self.add_result(TestResult(
+                name="Health Check (Gamma)",
+                success=False,
+                message=f"Failed: {healthy}",
+            ))
+        else:
+            self.add_result(TestResult(
+                name="Health Check (Gamma)",
+                success=healthy,
+                message="Gamma API responding" if healthy else "Gamma API not responding",
+            ))
+        
+        # Test 2: Fetch markets (Gamma)
+        if isinstance(markets, Exception):
+            self.add_result(TestResult(
+                name="Get Markets (Gamma)",
+                success=False,
+                message=f"Failed: {markets}",
+            ))
             markets = []
+        else:
+            self.add_result(TestResult(
+                name="Get Markets (Gamma)",
+                success=len(markets) > 0,
+                message=f"Found {len(markets)} markets",
+                details=f"First: {markets[0].get('question', 'N/A')[:50] if markets else 'N/A'}...",
+            ))
+        
+        # Test 3: Fetch orderbook (CLOB)
+        if markets:
             try:
-                markets = await client.get_markets(limit=5)
-                self.add_result(TestResult(
-                    name="Get Markets (Gamma)",
-                    success=len(markets) > 0,
-                    message=f"Found {len(markets)} markets",
-                    details=f"First: {markets[0].get('question', 'N/A')[:50] if markets else 'N/A'}...",
-                ))
+                condition_id = markets[0].get("condition_id") or markets[0].get("id")
+                if condition_id:
+                    orderbook = await client.get_orderbook(condition_id)
+                    # Orderbook might be None for AMM markets, which is okay
+                    self.add_result(TestResult(
+                        name="Get Orderbook (CLOB)",
+                        success=True,  # Success if no exception
+                        message=f"Orderbook for {condition_id[:20]}..." if orderbook else "No CLOB orderbook (AMM market)",
+                        details=f"Bids: {len(orderbook.yes_bids) if orderbook else 0}, Asks: {len(orderbook.yes_asks) if orderbook else 0}",
+                    ))
             except Exception as e:
                 self.add_result(TestResult(
-                    name="Get Markets (Gamma)",
+                    name="Get Orderbook (CLOB)",
                     success=False,
                     message=f"Failed: {e}",
                 ))
-            
-            # Test 3: Fetch orderbook (CLOB)
-            if markets:
-                try:
-                    condition_id = markets[0].get("condition_id") or markets[0].get("id")
-                    if condition_id:
-                        orderbook = await client.get_orderbook(condition_id)
-                        # Orderbook might be None for AMM markets, which is okay
-                        self.add_result(TestResult(
-                            name="Get Orderbook (CLOB)",
-                            success=True,  # Success if no exception
-                            message=f"Orderbook for {condition_id[:20]}..." if orderbook else "No CLOB orderbook (AMM market)",
-                            details=f"Bids: {len(orderbook.yes_bids) if orderbook else 0}, Asks: {len(orderbook.yes_asks) if orderbook else 0}",
-                        ))
-                except Exception as e:
-                    self.add_result(TestResult(
-                        name="Get Orderbook (CLOB)",
-                        success=False,
-                        message=f"Failed: {e}",
-                    ))
-            
-        finally:
-            await client.disconnect()
     
     async def test_polymarket_ws(self) -> None:
         """Test Polymarket WebSocket connectivity (brief connection only)."""
         from markets.polymarket.websocket.ws_client import PolymarketWebSocketClient
         
-        ws_url = get_polymarket_ws_url()
+        ws_url = self.urls["polymarket_ws"]
         
-        print(f"\nPolymarket WebSocket")
-        print(f"  URL: {ws_url}")
+        self.emit(f"\nPolymarket WebSocket")
+        self.emit(f"  URL: {ws_url}")
         
         client = PolymarketWebSocketClient()
         try:
-            await client.connect()
+            await _retry_connect(client)
             self.add_result(TestResult(
                 name="WebSocket Connect",
                 success=client.is_connected,
@@ -295,6 +442,11 @@ class SmokeTestRunner:
         finally:
             await client.disconnect()
     
+    def print_json(self) -> bool:
+        """Print all results as a JSON array and return True if all passed."""
+        print(orjson.dumps([asdict(r) for r in self.results]).decode())
+        return all(r.success for r in self.results)
+    
     def print_summary(self) -> bool:
         """Print test summary and return True if all passed."""
         print("\n" + "=" * 50)
@@ -322,35 +474,51 @@ async def main():
     parser.add_argument("--kalshi-only", action="store_true", help="Test Kalshi only")
     parser.add_argument("--polymarket-only", action="store_true", help="Test Polymarket only")
     parser.add_argument("--no-ws", action="store_true", help="Skip WebSocket tests")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON only")
     args = parser.parse_args()
     
     # Setup logging
     log_level = logging.DEBUG if args.verbose else logging.WARNING
     logging.basicConfig(level=log_level, format="%(levelname)s: %(message)s")
     
-    runner = SmokeTestRunner(verbose=args.verbose)
+    runner = SmokeTestRunner(verbose=args.verbose, json_output=args.json)
+    
+    if not args.json:
+        print("=" * 50)
+        print("API SMOKE TESTS")
+        print("=" * 50)
     
-    print("=" * 50)
-    print("API SMOKE TESTS")
-    print("=" * 50)
+    # (test, timeout in seconds); WS timeouts leave room for connect retries
+    tests = []
     
     # Kalshi tests
     if not args.polymarket_only:
-        await runner.test_kalshi_rest()
+        tests.append((runner.test_kalshi_rest, REST_TEST_TIMEOUT_S))
         if not args.no_ws:
-            await runner.test_kalshi_ws()
+            tests.append((runner.test_kalshi_ws, WS_TEST_TIMEOUT_S))
     
     # Polymarket tests
     if not args.kalshi_only:
-        await runner.test_polymarket_rest()
+        tests.append((runner.test_polymarket_rest, REST_TEST_TIMEOUT_S))
         if not args.no_ws:
-            await runner.test_polymarket_ws()
+            tests.append((runner.test_polymarket_ws, WS_TEST_TIMEOUT_S))
+    
+    # Platforms are independent network round-trips - overlap them
+    async with runner:
+        await runner.warm_up(
+            kalshi=not args.polymarket_only,
+            polymarket=not args.kalshi_only,
+        )
+        await runner.run(tests, total_timeout=TOTAL_TIMEOUT_S)
     
     # Summary
-    all_passed = runner.print_summary()
+    all_passed = runner.print_json() if args.json else runner.print_summary()
     
     sys.exit(0 if all_passed else 1)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if UVLOOP_AVAILABLE:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -2,12 +2,20 @@
 """Check trading volume by day."""
 
 import asyncio
+import sys
 from datetime import date, timedelta
 from dotenv import load_dotenv
 load_dotenv()
 
 from arbees_shared.db.connection import get_pool, close_pool
 
+# Optional uvloop event loop; falls back to the default asyncio loop
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 
 async def check_volume():
     pool = await get_pool()
@@ -18,29 +26,43 @@ async def check_volume():
     print('='*80)
 
     times = await pool.fetch("""
-        SELECT entry_time, market_title, side, size, pnl
+        SELECT
+            to_char(entry_time AT TIME ZONE 'UTC', 'HH24:MI:SS') AS entry_hms,
+            side,
+            size::float8 AS size,
+            COALESCE(pnl, 0)::float8 AS pnl,
+            LEFT(market_title, 40) AS title
         FROM paper_trades
-        WHERE DATE(entry_time) = $1
+        WHERE entry_time >= $1::date AND entry_time < $2::date
         ORDER BY entry_time
-    """, target_date)
+    """, target_date, target_date + timedelta(days=1))
 
     print(f'Total trades: {len(times)}')
-    for t in times:
-        print(f"  {t['entry_time'].strftime('%H:%M:%S')} {t['side']:4} "
-              f"size=${float(t['size']):>6.2f} pnl=${float(t['pnl'] or 0):>+6.2f} "
-              f"{t['market_title'][:40]}")
+    lines = [
+        f"  {t['entry_hms']} {t['side']:4} "
+        f"size=${t['size']:>6.2f} pnl=${t['pnl']:>+6.2f} "
+        f"{t['title']}"
+        for t in times
+    ]
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
     print('\n' + '='*80)
     print('VOLUME COMPARISON BY DAY (last 7 days):')
     print('='*80)
 
+    today = date.today()
+    rows = await pool.fetch("""
+        SELECT DATE(entry_time) as d, COUNT(*) as trades, COUNT(DISTINCT game_id) as games
+        FROM paper_trades
+        WHERE entry_time >= $1::date AND entry_time < $2::date
+        GROUP BY DATE(entry_time)
+    """, today - timedelta(days=7), today + timedelta(days=1))
+    by_day = {row['d']: row for row in rows}
+
     for i in range(-7, 1):
-        d = date.today() + timedelta(days=i)
-        row = await pool.fetchrow("""
-            SELECT COUNT(*) as trades, COUNT(DISTINCT game_id) as games
-            FROM paper_trades
-            WHERE DATE(entry_time) = $1
-        """, d)
+        d = today + timedelta(days=i)
+        row = by_day.get(d, {'trades': 0, 'games': 0})
         day_name = d.strftime('%A')[:3]
         marker = ' <-- TARGET' if d == target_date else ''
         print(f"  {d} ({day_name}): {row['games']:3} games, {row['trades']:4} trades{marker}")
@@ -49,4 +71,7 @@ async def check_volume():
 
 
 if __name__ == "__main__":
-    asyncio.run(check_volume())
+    if UVLOOP_AVAILABLE:
+        uvloop.run(check_volume())
+    else:
+        asyncio.run(check_volume())
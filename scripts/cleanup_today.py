@@ -8,40 +8,55 @@ This script:
 3. Optionally deletes/resets the bad data
 """
 
+import argparse
 import asyncio
-from datetime import date
+import sys
+from datetime import date, timedelta
+from itertools import groupby
+
+import orjson
 from dotenv import load_dotenv
 load_dotenv()
 
-from arbees_shared.db.connection import get_pool, close_pool
+from arbees_shared.db.connection import get_pool, close_pool, transaction
 from services.ml_analyzer.anomaly_detector import AnomalyDetector
 
+# Optional uvloop event loop; falls back to the default asyncio loop
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 
 async def run_anomaly_detection():
     """Run anomaly detection on today's data."""
-    pool = await get_pool()
     today = date.today()
 
     print(f"ANOMALY DETECTION FOR {today}")
     print("="*80)
 
-    # Get all trades for today
-    trades = await pool.fetch("""
-        SELECT * FROM paper_trades
-        WHERE DATE(entry_time) = $1 OR DATE(exit_time) = $1
-        ORDER BY entry_time
-    """, today)
+    # Stream today's trades through the detector; only per-game aggregates
+    # are kept in memory (asyncpg cursors require a transaction)
+    detector = AnomalyDetector()
+    trade_count = 0
+    async with transaction() as conn:
+        async for trade in conn.cursor("""
+            SELECT trade_id, game_id, market_title, side, status, outcome,
+                   entry_price, exit_price, size, pnl, entry_time
+            FROM paper_trades
+            WHERE (entry_time >= $1::date AND entry_time < $2::date)
+               OR (exit_time >= $1::date AND exit_time < $2::date)
+            ORDER BY entry_time
+        """, today, today + timedelta(days=1)):
+            detector.consume(trade)
+            trade_count += 1
 
-    if not trades:
+    if not trade_count:
         print("No trades found for today.")
         return
 
-    # Convert to list of dicts
-    trade_list = [dict(t) for t in trades]
-
-    # Run anomaly detection
-    detector = AnomalyDetector()
-    report = detector.analyze(trade_list, today)
+    report = detector.finalize(today)
 
     # Print results
     print(detector.format_report(report))
@@ -68,32 +83,45 @@ async def show_problematic_games(report):
     print("PROBLEMATIC GAMES DETAILS")
     print("="*80)
 
+    rows = await pool.fetch("""
+        SELECT game_id, trade_id, side,
+               entry_price::float8 AS entry_price,
+               COALESCE(exit_price, 0)::float8 AS exit_price,
+               size::float8 AS size,
+               COALESCE(pnl, 0)::float8 AS pnl,
+               outcome, entry_time, market_title
+        FROM paper_trades
+        WHERE game_id = ANY($1::text[])
+        ORDER BY game_id, entry_time
+    """, list(game_ids))
+    trades_by_game = {
+        game_id: list(game_trades)
+        for game_id, game_trades in groupby(rows, key=lambda t: t['game_id'])
+    }
+
     for game_id in game_ids:
-        trades = await pool.fetch("""
-            SELECT trade_id, side, entry_price, exit_price, size, pnl, outcome, entry_time, market_title
-            FROM paper_trades
-            WHERE game_id = $1
-            ORDER BY entry_time
-        """, game_id)
+        trades = trades_by_game.get(game_id, [])
 
         print(f"\n### Game: {game_id}")
         print(f"Trades: {len(trades)}")
 
         total_pnl = 0
         total_volume = 0
+        lines = []
         for t in trades:
-            pnl = float(t['pnl'] or 0)
-            size = float(t['size'])
+            pnl = t['pnl']
+            size = t['size']
             total_pnl += pnl
             total_volume += size
-            print(f"  {t['entry_time'].strftime('%H:%M:%S')} | {t['side']:4} | "
-                  f"entry={float(t['entry_price']):.3f} exit={float(t['exit_price'] or 0):.3f} | "
-                  f"size=${size:.2f} | pnl=${pnl:+.2f}")
+            lines.append(f"  {t['entry_time'].strftime('%H:%M:%S')} | {t['side']:4} | "
+                         f"entry={t['entry_price']:.3f} exit={t['exit_price']:.3f} | "
+                         f"size=${size:.2f} | pnl=${pnl:+.2f}")
 
-        print(f"  TOTAL: ${total_volume:,.2f} volume, ${total_pnl:+,.2f} PnL")
+        lines.append(f"  TOTAL: ${total_volume:,.2f} volume, ${total_pnl:+,.2f} PnL")
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
-async def cleanup_invalid_trades():
+async def cleanup_invalid_trades(assume_yes: bool = False):
     """Delete today's invalid trades and reset bankroll."""
     pool = await get_pool()
     today = date.today()
@@ -102,19 +130,23 @@ async def cleanup_invalid_trades():
     print("CLEANUP OPTIONS")
     print("="*80)
 
-    # Count trades
-    count = await pool.fetchval("""
-        SELECT COUNT(*) FROM paper_trades
-        WHERE DATE(entry_time) = $1 OR DATE(exit_time) = $1
-    """, today)
+    # Trade count, bankroll row and PnL split in one round-trip
+    summary = await pool.fetchrow("""
+        SELECT
+            (SELECT COUNT(*) FROM paper_trades
+             WHERE (entry_time >= $1::date AND entry_time < $2::date)
+                OR (exit_time >= $1::date AND exit_time < $2::date)) as trade_count,
+            (SELECT to_jsonb(b) FROM bankroll b WHERE b.account_name = 'default') as bankroll,
+            SUM(CASE WHEN exit_time >= $1::date AND exit_time < $2::date THEN pnl ELSE 0 END) as today_pnl,
+            SUM(CASE WHEN exit_time < $1::date THEN pnl ELSE 0 END) as past_pnl
+        FROM paper_trades
+        WHERE status = 'closed'
+    """, today, today + timedelta(days=1))
 
+    count = summary['trade_count']
     print(f"\nTotal trades today: {count}")
 
-    # Get current bankroll
-    row = await pool.fetchrow("""
-        SELECT * FROM bankroll WHERE account_name = 'default'
-    """)
-
+    row = orjson.loads(summary['bankroll']) if summary['bankroll'] else None
     if row:
         print(f"\nCurrent bankroll:")
         print(f"  Trading: ${float(row['current_balance']):,.2f}")
@@ -122,17 +154,8 @@ async def cleanup_invalid_trades():
         print(f"  Piggybank: ${piggy:,.2f}")
         print(f"  Initial: ${float(row['initial_balance']):,.2f}")
 
-    # Calculate what bankroll should be from yesterday
-    yesterday_result = await pool.fetchrow("""
-        SELECT
-            SUM(CASE WHEN DATE(exit_time) = $1 THEN pnl ELSE 0 END) as today_pnl,
-            SUM(CASE WHEN DATE(exit_time) < $1 THEN pnl ELSE 0 END) as past_pnl
-        FROM paper_trades
-        WHERE status = 'closed'
-    """, today)
-
-    today_pnl = float(yesterday_result['today_pnl'] or 0)
-    past_pnl = float(yesterday_result['past_pnl'] or 0)
+    today_pnl = float(summary['today_pnl'] or 0)
+    past_pnl = float(summary['past_pnl'] or 0)
 
     print(f"\nPnL breakdown:")
     print(f"  Today's PnL: ${today_pnl:,.2f}")
@@ -151,28 +174,38 @@ async def cleanup_invalid_trades():
     print("-"*80)
 
     # Prompt for confirmation
-    response = input("\nType 'DELETE' to cleanup today's trades, or anything else to cancel: ")
+    if assume_yes:
+        response = "DELETE"
+    else:
+        # Read stdin off the event loop so pool housekeeping keeps running
+        response = await asyncio.get_running_loop().run_in_executor(
+            None, input, "\nType 'DELETE' to cleanup today's trades, or anything else to cancel: "
+        )
 
     if response.strip() == "DELETE":
-        # Delete today's trades
-        deleted = await pool.execute("""
-            DELETE FROM paper_trades
-            WHERE DATE(entry_time) = $1
-        """, today)
-        print(f"\nDeleted trades from {today}")
+        # Delete and bankroll reset succeed or fail together
+        async with transaction() as conn:
+            # Delete today's trades
+            deleted = await conn.execute("""
+                DELETE FROM paper_trades
+                WHERE entry_time >= $1::date AND entry_time < $2::date
+            """, today, today + timedelta(days=1))
+
+            # Reset bankroll
+            if row:
+                initial = float(row['initial_balance'])
+                new_balance = initial + past_pnl
+                await conn.execute("""
+                    UPDATE bankroll
+                    SET current_balance = $1, piggybank_balance = 0,
+                        peak_balance = GREATEST(peak_balance, $1),
+                        trough_balance = LEAST(trough_balance, $1),
+                        updated_at = NOW()
+                    WHERE account_name = 'default'
+                """, new_balance)
 
-        # Reset bankroll
+        print(f"\nDeleted trades from {today}")
         if row:
-            initial = float(row['initial_balance'])
-            new_balance = initial + past_pnl
-            await pool.execute("""
-                UPDATE bankroll
-                SET current_balance = $1, piggybank_balance = 0,
-                    peak_balance = GREATEST(peak_balance, $1),
-                    trough_balance = LEAST(trough_balance, $1),
-                    updated_at = NOW()
-                WHERE account_name = 'default'
-            """, new_balance)
             print(f"Reset bankroll to ${new_balance:,.2f}")
 
         print("\nCleanup complete!")
@@ -182,6 +215,10 @@ async def cleanup_invalid_trades():
 
 async def main():
     """Run the full cleanup process."""
+    parser = argparse.ArgumentParser(description="Clean up today's invalid trades")
+    parser.add_argument("--yes", action="store_true", help="Skip the DELETE confirmation prompt")
+    args = parser.parse_args()
+
     try:
         # 1. Run anomaly detection
         report = await run_anomaly_detection()
@@ -191,7 +228,7 @@ async def main():
             await show_problematic_games(report)
 
             # 3. Offer to cleanup
-            await cleanup_invalid_trades()
+            await cleanup_invalid_trades(assume_yes=args.yes)
         else:
             print("\nNo anomalies detected. No cleanup needed.")
 
@@ -200,4 +237,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if UVLOOP_AVAILABLE:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
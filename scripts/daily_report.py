@@ -9,6 +9,78 @@ load_dotenv()
 
 from arbees_shared.db.connection import get_pool, close_pool
 
+# Summary, by-sport and by-game rollups in one pass over the day's trades.
+# The day's trades are the entry-time range plus exit-time range rows that
+# entered on another day: two disjoint index range scans with no OR/BitmapOr
+# merge and no de-duplication.
+# level (GROUPING bits of sport, game_id): 3 = summary, 1 = sport, 0 = game
+ROLLUP_SQL = """
+WITH day_trades AS (
+    SELECT game_id, market_title, sport, size, pnl, outcome, edge_at_entry
+    FROM paper_trades
+    WHERE entry_time >= $1::date AND entry_time < $1::date + 1
+    UNION ALL
+    SELECT game_id, market_title, sport, size, pnl, outcome, edge_at_entry
+    FROM paper_trades
+    WHERE exit_time >= $1::date AND exit_time < $1::date + 1
+      AND (entry_time < $1::date OR entry_time >= $1::date + 1)
+)
+SELECT
+    GROUPING(sport, game_id) as level,
+    game_id, market_title, sport,
+    COUNT(*) as trades,
+    COUNT(DISTINCT game_id) as games,
+    COALESCE(SUM(size), 0)::float8 as volume,
+    COALESCE(SUM(pnl), 0)::float8 as pnl,
+    COUNT(*) FILTER (WHERE outcome = 'win') as wins,
+    COUNT(*) FILTER (WHERE outcome = 'loss') as losses,
+    COALESCE(
+        100.0 * COUNT(*) FILTER (WHERE outcome = 'win')
+        / NULLIF(COUNT(*) FILTER (WHERE outcome IN ('win', 'loss')), 0),
+        0
+    )::float8 as win_rate,
+    COALESCE(AVG(size), 0)::float8 as avg_size,
+    COALESCE(AVG(edge_at_entry), 0)::float8 as avg_edge
+FROM day_trades
+GROUP BY GROUPING SETS ((), (sport), (game_id, market_title, sport))
+ORDER BY level DESC, volume DESC
+"""
+
+# Top and bottom 5 trades by PnL; the CTE is referenced twice, so Postgres
+# materializes it and paper_trades is scanned once.
+EXTREME_TRADES_SQL = """
+WITH day_closed AS (
+    SELECT trade_id, market_title, sport, side, entry_price, exit_price, size, pnl::float8 as pnl
+    FROM paper_trades
+    WHERE entry_time >= $1::date AND entry_time < $1::date + 1
+      AND pnl IS NOT NULL
+    UNION ALL
+    SELECT trade_id, market_title, sport, side, entry_price, exit_price, size, pnl::float8 as pnl
+    FROM paper_trades
+    WHERE exit_time >= $1::date AND exit_time < $1::date + 1
+      AND (entry_time < $1::date OR entry_time >= $1::date + 1)
+      AND pnl IS NOT NULL
+)
+(SELECT 'best' as bucket, * FROM day_closed ORDER BY pnl DESC LIMIT 5)
+UNION ALL
+(SELECT 'worst' as bucket, * FROM day_closed ORDER BY pnl ASC LIMIT 5)
+"""
+
+HOURLY_SQL = """
+SELECT DATE_TRUNC('hour', entry_time) as hour, COUNT(*) as trades,
+       COALESCE(SUM(pnl), 0)::float8 as pnl
+FROM paper_trades
+WHERE entry_time >= $1::date AND entry_time < $1::date + 1
+GROUP BY DATE_TRUNC('hour', entry_time)
+ORDER BY hour
+"""
+
+# Row templates; numeric columns arrive as float8 with NULLs coalesced in SQL
+SPORT_LINE = "  {:5} {:3} trades  ${:>8,.2f} vol  ${:>+8.2f} pnl  {:5.1f}% WR"
+GAME_LINE = SPORT_LINE + "  {}"
+TRADE_LINE = "  {:5} {:4} ${:>+7.2f}  {}"
+HOUR_LINE = "  {:%H:%M}: {:3} trades  ${:>+8.2f} pnl"
+
 
 async def full_report(target_date: date):
     pool = await get_pool()
@@ -17,124 +89,70 @@ async def full_report(target_date: date):
     print(f'FULL TRADING REPORT FOR {target_date} (UTC)')
     print('='*80)
 
-    # Summary stats
-    summary = await pool.fetchrow("""
-        SELECT
-            COUNT(*) as total_trades,
-            COUNT(DISTINCT game_id) as games,
-            SUM(size) as volume,
-            SUM(pnl) as total_pnl,
-            SUM(CASE WHEN outcome = 'win' THEN 1 ELSE 0 END) as wins,
-            SUM(CASE WHEN outcome = 'loss' THEN 1 ELSE 0 END) as losses,
-            AVG(size) as avg_size,
-            AVG(edge_at_entry) as avg_edge
-        FROM paper_trades
-        WHERE DATE(entry_time) = $1 OR DATE(exit_time) = $1
-    """, target_date)
-
-    total = (summary['wins'] or 0) + (summary['losses'] or 0)
-    wr = (summary['wins'] / total * 100) if total > 0 else 0
-
-    print(f"""
+    # Independent queries; run them concurrently
+    rollup, extremes, hourly = await asyncio.gather(
+        pool.fetch(ROLLUP_SQL, target_date),
+        pool.fetch(EXTREME_TRADES_SQL, target_date),
+        pool.fetch(HOURLY_SQL, target_date),
+    )
+
+    # Build the report in memory and write it once
+    lines = []
+    out = lines.append
+
+    summary = rollup[0]
+    sports = [r for r in rollup if r['level'] == 1]
+    games = [r for r in rollup if r['level'] == 0][:20]
+    best = [t for t in extremes if t['bucket'] == 'best']
+    worst = [t for t in extremes if t['bucket'] == 'worst']
+
+    out(f"""
 SUMMARY:
-  Total Trades: {summary['total_trades']}
+  Total Trades: {summary['trades']}
   Games: {summary['games']}
-  Volume: ${float(summary['volume'] or 0):,.2f}
-  Total PnL: ${float(summary['total_pnl'] or 0):+,.2f}
-  Win Rate: {wr:.1f}% ({summary['wins']}W / {summary['losses']}L)
-  Avg Size: ${float(summary['avg_size'] or 0):.2f}
-  Avg Edge: {float(summary['avg_edge'] or 0):.2f}%
+  Volume: ${summary['volume']:,.2f}
+  Total PnL: ${summary['pnl']:+,.2f}
+  Win Rate: {summary['win_rate']:.1f}% ({summary['wins']}W / {summary['losses']}L)
+  Avg Size: ${summary['avg_size']:.2f}
+  Avg Edge: {summary['avg_edge']:.2f}%
 """)
 
     # By sport
-    sports = await pool.fetch("""
-        SELECT sport,
-            COUNT(*) as trades,
-            SUM(size) as volume,
-            SUM(pnl) as pnl,
-            SUM(CASE WHEN outcome = 'win' THEN 1 ELSE 0 END) as wins,
-            SUM(CASE WHEN outcome = 'loss' THEN 1 ELSE 0 END) as losses
-        FROM paper_trades
-        WHERE DATE(entry_time) = $1 OR DATE(exit_time) = $1
-        GROUP BY sport
-        ORDER BY volume DESC
-    """, target_date)
-
-    print('BY SPORT:')
-    print('-'*60)
+    out('BY SPORT:')
+    out('-'*60)
     for s in sports:
-        total = (s['wins'] or 0) + (s['losses'] or 0)
-        wr = (s['wins'] / total * 100) if total > 0 else 0
-        print(f"  {s['sport']:5} {s['trades']:3} trades  ${float(s['volume']):>8,.2f} vol  "
-              f"${float(s['pnl'] or 0):>+8.2f} pnl  {wr:5.1f}% WR")
+        out(SPORT_LINE.format(s['sport'], s['trades'], s['volume'], s['pnl'], s['win_rate']))
 
     # Best and worst trades
-    best = await pool.fetch("""
-        SELECT trade_id, market_title, sport, side, entry_price, exit_price, size, pnl
-        FROM paper_trades
-        WHERE (DATE(entry_time) = $1 OR DATE(exit_time) = $1) AND pnl IS NOT NULL
-        ORDER BY pnl DESC
-        LIMIT 5
-    """, target_date)
-
-    worst = await pool.fetch("""
-        SELECT trade_id, market_title, sport, side, entry_price, exit_price, size, pnl
-        FROM paper_trades
-        WHERE (DATE(entry_time) = $1 OR DATE(exit_time) = $1) AND pnl IS NOT NULL
-        ORDER BY pnl ASC
-        LIMIT 5
-    """, target_date)
-
-    print()
-    print('BEST TRADES:')
-    print('-'*60)
+    out('')
+    out('BEST TRADES:')
+    out('-'*60)
     for t in best:
-        print(f"  {t['sport']:5} {t['side']:4} ${float(t['pnl']):>+7.2f}  {t['market_title'][:35]}")
+        out(TRADE_LINE.format(t['sport'], t['side'], t['pnl'], t['market_title'][:35]))
 
-    print()
-    print('WORST TRADES:')
-    print('-'*60)
+    out('')
+    out('WORST TRADES:')
+    out('-'*60)
     for t in worst:
-        print(f"  {t['sport']:5} {t['side']:4} ${float(t['pnl']):>+7.2f}  {t['market_title'][:35]}")
+        out(TRADE_LINE.format(t['sport'], t['side'], t['pnl'], t['market_title'][:35]))
 
     # By game
-    games = await pool.fetch("""
-        SELECT game_id, market_title, sport,
-            COUNT(*) as trades,
-            SUM(size) as volume,
-            SUM(pnl) as pnl,
-            SUM(CASE WHEN outcome = 'win' THEN 1 ELSE 0 END) as wins,
-            SUM(CASE WHEN outcome = 'loss' THEN 1 ELSE 0 END) as losses
-        FROM paper_trades
-        WHERE DATE(entry_time) = $1 OR DATE(exit_time) = $1
-        GROUP BY game_id, market_title, sport
-        ORDER BY volume DESC
-        LIMIT 20
-    """, target_date)
-
-    print()
-    print('BY GAME/TEAM:')
-    print('-'*80)
+    out('')
+    out('BY GAME/TEAM:')
+    out('-'*80)
     for g in games:
-        total = (g['wins'] or 0) + (g['losses'] or 0)
-        wr = (g['wins'] / total * 100) if total > 0 else 0
-        print(f"  {g['sport']:5} {g['trades']:3} trades  ${float(g['volume']):>8,.2f} vol  "
-              f"${float(g['pnl'] or 0):>+8.2f} pnl  {wr:5.1f}% WR  {g['market_title'][:30]}")
+        out(GAME_LINE.format(
+            g['sport'], g['trades'], g['volume'], g['pnl'], g['win_rate'], g['market_title'][:30]
+        ))
 
     # Hourly distribution
-    hourly = await pool.fetch("""
-        SELECT DATE_TRUNC('hour', entry_time) as hour, COUNT(*) as trades, SUM(pnl) as pnl
-        FROM paper_trades
-        WHERE DATE(entry_time) = $1
-        GROUP BY DATE_TRUNC('hour', entry_time)
-        ORDER BY hour
-    """, target_date)
-
-    print()
-    print('HOURLY DISTRIBUTION:')
-    print('-'*60)
+    out('')
+    out('HOURLY DISTRIBUTION:')
+    out('-'*60)
     for h in hourly:
-        print(f"  {h['hour'].strftime('%H:%M')}: {h['trades']:3} trades  ${float(h['pnl'] or 0):>+8.2f} pnl")
+        out(HOUR_LINE.format(h['hour'], h['trades'], h['pnl']))
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
     await close_pool()
 
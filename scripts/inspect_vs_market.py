@@ -27,11 +27,24 @@ async def main():
         
         if not markets:
             print("No 'vs' markets found. Searching 'nba'...")
-            markets = await client.search_markets("vs", limit=5, sport="nba")
+            # The fallback is best effort: its failure shouldn't end the inspection
+            try:
+                markets = await client.search_markets("vs", limit=5, sport="nba")
+            except Exception as e:
+                print(f"NBA fallback search failed: {e}")
+                markets = []
             
         print(f"Found {len(markets)} markets.")
 
-        for m in markets[:2]:
+        # Resolve YES tokens for the inspected markets concurrently (may hit
+        # Gamma/CLOB fallbacks); errors are re-raised per market below
+        inspected = markets[:2]
+        yes_tokens = await asyncio.gather(
+            *(client.resolve_yes_token_id(m) for m in inspected),
+            return_exceptions=True,
+        )
+
+        for m, yes_token in zip(inspected, yes_tokens, strict=True):
             try:
                 title = m.get("question", m.get("title", ""))
                 mid = m.get("condition_id") or m.get("id")
@@ -45,7 +58,8 @@ async def main():
                 print(f"  CLOB Token IDs: {clob_ids} (Type: {type(clob_ids)})")
                 
                 # Test token resolution
-                yes_token = await client.resolve_yes_token_id(m)
+                if isinstance(yes_token, Exception):
+                    raise yes_token
                 print(f"  Legacy YES Token: {yes_token}")
                 
                 # Test Explicit resolution
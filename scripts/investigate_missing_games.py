@@ -2,12 +2,185 @@
 """Investigate missing games in trade reports."""
 
 import asyncio
-from datetime import date
+import sys
+from datetime import date, timedelta
 from dotenv import load_dotenv
 load_dotenv()
 
 from arbees_shared.db.connection import get_pool, close_pool
 
+TRADES_BY_GAME_SQL = """
+WITH day_trades AS (
+    SELECT game_id, market_title, sport, pnl
+    FROM paper_trades
+    WHERE entry_time >= $1::date AND entry_time < $1::date + 1
+    UNION ALL
+    SELECT game_id, market_title, sport, pnl
+    FROM paper_trades
+    WHERE exit_time >= $1::date AND exit_time < $1::date + 1
+      AND (entry_time < $1::date OR entry_time >= $1::date + 1)
+)
+SELECT game_id, market_title, sport, COUNT(*) as trade_count,
+       COALESCE(SUM(pnl), 0)::float8 as total_pnl
+FROM day_trades
+GROUP BY game_id, market_title, sport
+ORDER BY sport, game_id
+"""
+
+GAMES_MONITORED_SQL = """
+SELECT game_id, sport,
+    MIN(time) as first_seen,
+    MAX(time) as last_seen,
+    COUNT(*) as state_count
+FROM game_states
+WHERE time >= $1::date AND time < $1::date + 1
+GROUP BY game_id, sport
+ORDER BY sport, game_id
+"""
+
+SIGNALS_SQL = """
+SELECT game_id, team, direction, COUNT(*) as signal_count
+FROM trading_signals
+WHERE time >= $1::date AND time < $1::date + 1
+GROUP BY game_id, team, direction
+ORDER BY game_id
+"""
+
+# A day's per-market price counts, from the raw table or the daily rollup
+# (migration 029); the rollup variant sorts one row per market instead of
+# every price snapshot. Rollup buckets are UTC days.
+DAY_MARKETS_SQL = """
+    SELECT market_id, COUNT(*) as price_count
+    FROM market_prices
+    WHERE time >= $1::date AND time < $1::date + 1
+    GROUP BY market_id
+"""
+
+DAY_MARKETS_ROLLUP_SQL = """
+    SELECT market_id, SUM(price_count)::bigint as price_count
+    FROM market_prices_daily_markets
+    WHERE bucket >= ($1::date)::timestamp AT TIME ZONE 'UTC'
+      AND bucket < ($1::date + 1)::timestamp AT TIME ZONE 'UTC'
+    GROUP BY market_id
+"""
+
+_MARKET_PRICES = """
+WITH day_markets AS ({day_markets})
+SELECT market_id, price_count
+FROM day_markets
+ORDER BY price_count DESC
+LIMIT 30
+"""
+
+MARKET_PRICES_SQL = _MARKET_PRICES.format(day_markets=DAY_MARKETS_SQL)
+MARKET_PRICES_ROLLUP_SQL = _MARKET_PRICES.format(day_markets=DAY_MARKETS_ROLLUP_SQL)
+
+SIGNALS_WITHOUT_TRADES_SQL = """
+SELECT s.game_id, s.team, s.direction,
+       COALESCE(s.edge_pct, 0)::float8 as edge_pct,
+       COALESCE(s.model_prob, 0)::float8 as model_prob,
+       COALESCE(s.market_prob, 0)::float8 as market_prob,
+       s.time, s.signal_type
+FROM trading_signals s
+LEFT JOIN paper_trades t ON s.game_id = t.game_id
+    AND (s.team = t.market_title OR s.team LIKE '%' || t.market_title || '%')
+WHERE s.time >= $1::date AND s.time < $1::date + 1
+AND t.trade_id IS NULL
+ORDER BY s.time
+LIMIT 30
+"""
+
+SPORTS_SQL = """
+SELECT sport, COUNT(DISTINCT game_id) as game_count
+FROM game_states
+WHERE time >= $1::date AND time < $1::date + 1
+GROUP BY sport
+ORDER BY game_count DESC
+"""
+
+SPORTS_ROLLUP_SQL = """
+SELECT sport, COUNT(DISTINCT game_id) as game_count
+FROM game_states_daily_games
+WHERE bucket >= ($1::date)::timestamp AT TIME ZONE 'UTC'
+  AND bucket < ($1::date + 1)::timestamp AT TIME ZONE 'UTC'
+GROUP BY sport
+ORDER BY game_count DESC
+"""
+
+HOURLY_TRADES_SQL = """
+SELECT DATE_TRUNC('hour', entry_time) as hour, COUNT(*) as trades
+FROM paper_trades
+WHERE entry_time >= $1::date AND entry_time < $1::date + 1
+GROUP BY DATE_TRUNC('hour', entry_time)
+ORDER BY hour
+"""
+
+# Collapse both sides before matching: the day's distinct markets against the
+# distinct signal game_ids, instead of every price row against every signal.
+_MARKETS_WITHOUT_SIGNALS = """
+WITH day_markets AS ({day_markets}),
+signal_games AS (
+    SELECT DISTINCT game_id
+    FROM trading_signals
+    WHERE game_id IS NOT NULL
+)
+SELECT dm.market_id, dm.price_count
+FROM day_markets dm
+WHERE NOT EXISTS (
+    SELECT 1 FROM signal_games sg
+    WHERE strpos(dm.market_id, sg.game_id) > 0
+)
+ORDER BY dm.price_count DESC
+LIMIT 20
+"""
+
+MARKETS_WITHOUT_SIGNALS_SQL = _MARKETS_WITHOUT_SIGNALS.format(day_markets=DAY_MARKETS_SQL)
+MARKETS_WITHOUT_SIGNALS_ROLLUP_SQL = _MARKETS_WITHOUT_SIGNALS.format(
+    day_markets=DAY_MARKETS_ROLLUP_SQL
+)
+
+DAY_COUNTS_SQL = """
+SELECT
+    (SELECT COUNT(DISTINCT game_id) FROM game_states WHERE time >= $1::date AND time < $1::date + 1) as games,
+    (SELECT COUNT(*) FROM paper_trades WHERE entry_time >= $1::date AND entry_time < $1::date + 1) as trades,
+    (SELECT COUNT(DISTINCT game_id) FROM trading_signals WHERE time >= $1::date AND time < $1::date + 1) as signal_games,
+    (SELECT COUNT(DISTINCT market_id) FROM market_prices WHERE time >= $1::date AND time < $1::date + 1) as markets
+"""
+
+# Same counts with the distinct keys read from the daily rollups (migration
+# 029) rather than hashing every raw row of the day. Rollup buckets are UTC days.
+DAY_COUNTS_ROLLUP_SQL = """
+SELECT
+    (SELECT COUNT(DISTINCT game_id) FROM game_states_daily_games
+     WHERE bucket >= ($1::date)::timestamp AT TIME ZONE 'UTC'
+       AND bucket < ($1::date + 1)::timestamp AT TIME ZONE 'UTC') as games,
+    (SELECT COUNT(*) FROM paper_trades WHERE entry_time >= $1::date AND entry_time < $1::date + 1) as trades,
+    (SELECT COUNT(DISTINCT game_id) FROM trading_signals_daily_games
+     WHERE bucket >= ($1::date)::timestamp AT TIME ZONE 'UTC'
+       AND bucket < ($1::date + 1)::timestamp AT TIME ZONE 'UTC') as signal_games,
+    (SELECT COUNT(DISTINCT market_id) FROM market_prices_daily_markets
+     WHERE bucket >= ($1::date)::timestamp AT TIME ZONE 'UTC'
+       AND bucket < ($1::date + 1)::timestamp AT TIME ZONE 'UTC') as markets
+"""
+
+# The rollups are only used when they give the same answer as the raw tables:
+# migration 029 runs only on fresh volumes (initdb), so older deployments may
+# not have the views, and UTC buckets only match this session's day boundaries
+# when the session time zone has no UTC offset anywhere in the report window.
+ROLLUPS_USABLE_SQL = """
+SELECT
+    to_regclass('game_states_daily_games') IS NOT NULL
+    AND to_regclass('trading_signals_daily_games') IS NOT NULL
+    AND to_regclass('market_prices_daily_markets') IS NOT NULL
+    AND NOT EXISTS (
+        SELECT 1
+        FROM generate_series($1::date, $2::date, interval '1 day') AS d
+        WHERE d::date::timestamptz <> d::date::timestamp AT TIME ZONE 'UTC'
+    )
+"""
+
+COMPARISON_DELTAS = (-2, -1, 0, 1, 2)
+
 
 async def investigate(target_date: date):
     pool = await get_pool()
@@ -16,184 +189,127 @@ async def investigate(target_date: date):
     print(f'INVESTIGATION: Missing games for {target_date}')
     print('='*80)
 
+    comparison_dates = [target_date + timedelta(days=d) for d in COMPARISON_DELTAS]
+    use_rollups = await pool.fetchval(
+        ROLLUPS_USABLE_SQL, comparison_dates[0], comparison_dates[-1] + timedelta(days=1)
+    )
+    sports_sql = SPORTS_ROLLUP_SQL if use_rollups else SPORTS_SQL
+    market_prices_sql = MARKET_PRICES_ROLLUP_SQL if use_rollups else MARKET_PRICES_SQL
+    markets_no_signals_sql = (
+        MARKETS_WITHOUT_SIGNALS_ROLLUP_SQL if use_rollups else MARKETS_WITHOUT_SIGNALS_SQL
+    )
+    day_counts_sql = DAY_COUNTS_ROLLUP_SQL if use_rollups else DAY_COUNTS_SQL
+
+    # Every section's queries are independent; run them concurrently
+    (trades, game_states, signals, prices, signals_no_trades, sports, hourly,
+     markets_no_signals, *day_counts) = await asyncio.gather(
+        pool.fetch(TRADES_BY_GAME_SQL, target_date),
+        pool.fetch(GAMES_MONITORED_SQL, target_date),
+        pool.fetch(SIGNALS_SQL, target_date),
+        pool.fetch(market_prices_sql, target_date),
+        pool.fetch(SIGNALS_WITHOUT_TRADES_SQL, target_date),
+        pool.fetch(sports_sql, target_date),
+        pool.fetch(HOURLY_TRADES_SQL, target_date),
+        pool.fetch(markets_no_signals_sql, target_date),
+        *(pool.fetchrow(day_counts_sql, d) for d in comparison_dates),
+    )
+
+    # Build the report in memory and write it once
+    lines = []
+    out = lines.append
+
     # 1. Check all trades for that day
-    trades = await pool.fetch("""
-        SELECT DISTINCT game_id, market_title, sport, COUNT(*) as trade_count, SUM(pnl) as total_pnl
-        FROM paper_trades
-        WHERE DATE(entry_time) = $1 OR DATE(exit_time) = $1
-        GROUP BY game_id, market_title, sport
-        ORDER BY sport, game_id
-    """, target_date)
-
-    print(f'\n1. TRADES BY GAME (from paper_trades):')
-    print('-'*80)
+    out(f'\n1. TRADES BY GAME (from paper_trades):')
+    out('-'*80)
     games_with_trades = set()
     for t in trades:
         games_with_trades.add(t['game_id'])
-        print(f"  {t['sport']:5} {t['game_id'][:12]}... {t['trade_count']:3} trades  ${float(t['total_pnl'] or 0):>8.2f} pnl  {t['market_title'][:40]}")
-    print(f'Total unique games with trades: {len(games_with_trades)}')
+        out(f"  {t['sport']:5} {t['game_id'][:12]}... {t['trade_count']:3} trades  ${t['total_pnl']:>8.2f} pnl  {t['market_title'][:40]}")
+    out(f'Total unique games with trades: {len(games_with_trades)}')
 
     # 2. Check game_states for that day - what games did we monitor?
-    game_states = await pool.fetch("""
-        SELECT DISTINCT game_id, sport,
-            MIN(time) as first_seen,
-            MAX(time) as last_seen,
-            COUNT(*) as state_count
-        FROM game_states
-        WHERE DATE(time) = $1
-        GROUP BY game_id, sport
-        ORDER BY sport, game_id
-    """, target_date)
-
-    print(f'\n2. GAMES MONITORED (from game_states):')
-    print('-'*80)
+    out(f'\n2. GAMES MONITORED (from game_states):')
+    out('-'*80)
     games_monitored = set()
     for g in game_states:
         games_monitored.add(g['game_id'])
         had_trades = '[HAS TRADES]' if g['game_id'] in games_with_trades else '[NO TRADES]'
-        print(f"  {g['sport']:5} {g['game_id'][:12]}... {g['state_count']:5} states  {had_trades}")
-    print(f'Total games monitored: {len(games_monitored)}')
+        out(f"  {g['sport']:5} {g['game_id'][:12]}... {g['state_count']:5} states  {had_trades}")
+    out(f'Total games monitored: {len(games_monitored)}')
 
     # 3. Games monitored but no trades
     missing = games_monitored - games_with_trades
-    print(f'\n3. GAMES MONITORED BUT NO TRADES: {len(missing)}')
-    print('-'*80)
+    out(f'\n3. GAMES MONITORED BUT NO TRADES: {len(missing)}')
+    out('-'*80)
     for gid in list(missing)[:20]:
-        print(f'  {gid}')
+        out(f'  {gid}')
 
     # 4. Check signals for that day
-    signals = await pool.fetch("""
-        SELECT DISTINCT game_id, team, direction, COUNT(*) as signal_count
-        FROM trading_signals
-        WHERE DATE(time) = $1
-        GROUP BY game_id, team, direction
-        ORDER BY game_id
-    """, target_date)
-
-    print(f'\n4. SIGNALS GENERATED (from trading_signals):')
-    print('-'*80)
+    out(f'\n4. SIGNALS GENERATED (from trading_signals):')
+    out('-'*80)
     games_with_signals = set()
     for s in signals:
         games_with_signals.add(s['game_id'])
         had_trades = '[Y]' if s['game_id'] in games_with_trades else '[N]'
-        print(f"  {s['game_id'][:12]}... {s['signal_count']:3} signals  {s['direction']:4}  {had_trades}  {s['team'][:30]}")
-    print(f'Total games with signals: {len(games_with_signals)}')
+        out(f"  {s['game_id'][:12]}... {s['signal_count']:3} signals  {s['direction']:4}  {had_trades}  {s['team'][:30]}")
+    out(f'Total games with signals: {len(games_with_signals)}')
 
     # 5. Check market_prices for that day
-    prices = await pool.fetch("""
-        SELECT DISTINCT market_id,
-            COUNT(*) as price_count,
-            MIN(time) as first_price,
-            MAX(time) as last_price
-        FROM market_prices
-        WHERE DATE(time) = $1
-        GROUP BY market_id
-        ORDER BY price_count DESC
-        LIMIT 30
-    """, target_date)
-
-    print(f'\n5. MARKET PRICES RECORDED (from market_prices):')
-    print('-'*80)
-    print(f'Total markets with prices: {len(prices)}')
+    out(f'\n5. MARKET PRICES RECORDED (from market_prices):')
+    out('-'*80)
+    out(f'Total markets with prices: {len(prices)}')
     for p in prices[:15]:
-        print(f"  {p['market_id'][:50]}... {p['price_count']:5} prices")
+        out(f"  {p['market_id'][:50]}... {p['price_count']:5} prices")
     if len(prices) > 15:
-        print(f'  ... and {len(prices) - 15} more markets')
+        out(f'  ... and {len(prices) - 15} more markets')
 
     # 6. Check for signals that didn't result in trades
-    print(f'\n6. SIGNALS WITHOUT TRADES:')
-    print('-'*80)
-    signals_no_trades = await pool.fetch("""
-        SELECT s.game_id, s.team, s.direction, s.edge_pct, s.model_prob, s.market_prob,
-               s.time, s.signal_type
-        FROM trading_signals s
-        LEFT JOIN paper_trades t ON s.game_id = t.game_id
-            AND (s.team = t.market_title OR s.team LIKE '%' || t.market_title || '%')
-        WHERE DATE(s.time) = $1
-        AND t.trade_id IS NULL
-        ORDER BY s.time
-        LIMIT 30
-    """, target_date)
-
-    print(f'Signals with NO corresponding trades: {len(signals_no_trades)}')
+    out(f'\n6. SIGNALS WITHOUT TRADES:')
+    out('-'*80)
+    out(f'Signals with NO corresponding trades: {len(signals_no_trades)}')
     for s in signals_no_trades[:15]:
-        print(f"  {s['game_id'][:12]}... {s['direction']:4} edge={float(s['edge_pct'] or 0):5.1f}% "
-              f"model={float(s['model_prob'] or 0):.3f} market={float(s['market_prob'] or 0):.3f} "
-              f"{s['team'][:25]}")
+        out(f"  {s['game_id'][:12]}... {s['direction']:4} edge={s['edge_pct']:5.1f}% "
+            f"model={s['model_prob']:.3f} market={s['market_prob']:.3f} "
+            f"{s['team'][:25]}")
 
     # 7. Check what sports/leagues had games that day
-    print(f'\n7. SPORTS BREAKDOWN:')
-    print('-'*80)
-    sports = await pool.fetch("""
-        SELECT sport, COUNT(DISTINCT game_id) as game_count
-        FROM game_states
-        WHERE DATE(time) = $1
-        GROUP BY sport
-        ORDER BY game_count DESC
-    """, target_date)
-
+    out(f'\n7. SPORTS BREAKDOWN:')
+    out('-'*80)
     for sp in sports:
-        print(f"  {sp['sport']:10} {sp['game_count']:3} games monitored")
+        out(f"  {sp['sport']:10} {sp['game_count']:3} games monitored")
 
     # 8. Check execution service logs / errors
-    print(f'\n8. CHECKING EXECUTION METRICS:')
-    print('-'*80)
+    out(f'\n8. CHECKING EXECUTION METRICS:')
+    out('-'*80)
 
     # Count trades per hour to see if there were outages
-    hourly = await pool.fetch("""
-        SELECT DATE_TRUNC('hour', entry_time) as hour, COUNT(*) as trades
-        FROM paper_trades
-        WHERE DATE(entry_time) = $1
-        GROUP BY DATE_TRUNC('hour', entry_time)
-        ORDER BY hour
-    """, target_date)
-
-    print('Trades per hour:')
+    out('Trades per hour:')
     for h in hourly:
-        print(f"  {h['hour'].strftime('%H:%M')}: {h['trades']} trades")
+        out(f"  {h['hour'].strftime('%H:%M')}: {h['trades']} trades")
 
     # Check for markets that had prices but no signals
-    print(f'\n9. MARKETS WITH PRICES BUT NO SIGNALS:')
-    print('-'*80)
-
-    markets_no_signals = await pool.fetch("""
-        SELECT DISTINCT mp.market_id, COUNT(*) as price_count
-        FROM market_prices mp
-        LEFT JOIN trading_signals ts ON mp.market_id LIKE '%' || ts.game_id || '%'
-        WHERE DATE(mp.time) = $1
-        AND ts.signal_id IS NULL
-        GROUP BY mp.market_id
-        ORDER BY price_count DESC
-        LIMIT 20
-    """, target_date)
-
-    print(f'Markets with prices but no signals: {len(markets_no_signals)}')
+    out(f'\n9. MARKETS WITH PRICES BUT NO SIGNALS:')
+    out('-'*80)
+    out(f'Markets with prices but no signals: {len(markets_no_signals)}')
     for m in markets_no_signals[:10]:
-        print(f"  {m['market_id'][:60]}... {m['price_count']} prices")
+        out(f"  {m['market_id'][:60]}... {m['price_count']} prices")
 
     # 10. Compare with surrounding days
-    print(f'\n10. COMPARISON WITH SURROUNDING DAYS:')
-    print('-'*80)
-
-    from datetime import timedelta
-    for delta in [-2, -1, 0, 1, 2]:
-        check_date = target_date + timedelta(days=delta)
-        counts = await pool.fetchrow("""
-            SELECT
-                (SELECT COUNT(DISTINCT game_id) FROM game_states WHERE DATE(time) = $1) as games,
-                (SELECT COUNT(*) FROM paper_trades WHERE DATE(entry_time) = $1) as trades,
-                (SELECT COUNT(DISTINCT game_id) FROM trading_signals WHERE DATE(time) = $1) as signal_games,
-                (SELECT COUNT(DISTINCT market_id) FROM market_prices WHERE DATE(time) = $1) as markets
-        """, check_date)
+    out(f'\n10. COMPARISON WITH SURROUNDING DAYS:')
+    out('-'*80)
+    for delta, check_date, counts in zip(
+        COMPARISON_DELTAS, comparison_dates, day_counts, strict=True
+    ):
         marker = " <-- TARGET" if delta == 0 else ""
-        print(f"  {check_date}: {counts['games']:3} games, {counts['trades']:4} trades, "
-              f"{counts['signal_games']:3} signal_games, {counts['markets']:3} markets{marker}")
+        out(f"  {check_date}: {counts['games']:3} games, {counts['trades']:4} trades, "
+            f"{counts['signal_games']:3} signal_games, {counts['markets']:3} markets{marker}")
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
     await close_pool()
 
 
 if __name__ == "__main__":
-    import sys
     if len(sys.argv) > 1:
         # Parse date from argument
         parts = sys.argv[1].split('-')
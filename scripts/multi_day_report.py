@@ -9,6 +9,138 @@ load_dotenv()
 
 from arbees_shared.db.connection import get_pool, close_pool
 
+# A trade belongs to each day it entered or exited on; the exit branch skips
+# same-day round trips so no trade is counted twice for one day. Trades are
+# grouped per (day, game) first, so the per-day game count is a plain count
+# of groups (hash aggregate) rather than a COUNT(DISTINCT) sort.
+DAILY_SQL = """
+WITH day_trades AS (
+    SELECT DATE(entry_time) as d, game_id, size, pnl, outcome
+    FROM paper_trades
+    WHERE entry_time >= $1::date AND entry_time < $2::date + 1
+    UNION ALL
+    SELECT DATE(exit_time) as d, game_id, size, pnl, outcome
+    FROM paper_trades
+    WHERE exit_time >= $1::date AND exit_time < $2::date + 1
+      AND DATE(exit_time) <> DATE(entry_time)
+),
+day_games AS (
+    SELECT
+        d,
+        game_id,
+        COUNT(*) as trades,
+        SUM(size) as volume,
+        SUM(pnl) as pnl,
+        COUNT(*) FILTER (WHERE outcome = 'win') as wins,
+        COUNT(*) FILTER (WHERE outcome = 'loss') as losses
+    FROM day_trades
+    GROUP BY d, game_id
+)
+SELECT
+    d,
+    SUM(trades)::bigint as trades,
+    COUNT(game_id) as games,
+    COALESCE(SUM(volume), 0)::float8 as volume,
+    COALESCE(SUM(pnl), 0)::float8 as pnl,
+    SUM(wins)::bigint as wins,
+    SUM(losses)::bigint as losses,
+    COALESCE(100.0 * SUM(wins) / NULLIF(SUM(wins) + SUM(losses), 0), 0)::float8 as win_rate
+FROM day_games
+GROUP BY d
+"""
+
+# Every trade entered or exited in the period, once each: two range scans on
+# the entry_time / exit_time indexes instead of an OR across both columns.
+PERIOD_TRADES_CTE = """
+period_trades AS (
+    SELECT trade_id, game_id, market_title, sport, side, size, pnl, outcome,
+           edge_at_entry, entry_time
+    FROM paper_trades
+    WHERE entry_time >= $1::date AND entry_time < $2::date + 1
+    UNION ALL
+    SELECT trade_id, game_id, market_title, sport, side, size, pnl, outcome,
+           edge_at_entry, entry_time
+    FROM paper_trades
+    WHERE exit_time >= $1::date AND exit_time < $2::date + 1
+      AND (entry_time < $1::date OR entry_time >= $2::date + 1)
+)"""
+
+SUMMARY_SQL = "WITH" + PERIOD_TRADES_CTE + """
+SELECT
+    COUNT(*) as total_trades,
+    COUNT(DISTINCT game_id) as games,
+    COALESCE(SUM(size), 0)::float8 as volume,
+    COALESCE(SUM(pnl), 0)::float8 as total_pnl,
+    COUNT(*) FILTER (WHERE outcome = 'win') as wins,
+    COUNT(*) FILTER (WHERE outcome = 'loss') as losses,
+    COALESCE(
+        100.0 * COUNT(*) FILTER (WHERE outcome = 'win')
+        / NULLIF(COUNT(*) FILTER (WHERE outcome IN ('win', 'loss')), 0),
+        0
+    )::float8 as win_rate,
+    COALESCE(AVG(size), 0)::float8 as avg_size,
+    COALESCE(AVG(edge_at_entry), 0)::float8 as avg_edge
+FROM period_trades
+"""
+
+SPORTS_SQL = "WITH" + PERIOD_TRADES_CTE + """
+SELECT sport,
+    COUNT(*) as trades,
+    COALESCE(SUM(size), 0)::float8 as volume,
+    COALESCE(SUM(pnl), 0)::float8 as pnl,
+    COALESCE(
+        100.0 * COUNT(*) FILTER (WHERE outcome = 'win')
+        / NULLIF(COUNT(*) FILTER (WHERE outcome IN ('win', 'loss')), 0),
+        0
+    )::float8 as win_rate
+FROM period_trades
+GROUP BY sport
+ORDER BY volume DESC
+"""
+
+# Top and bottom 5 trades by PnL; the CTE is referenced twice, so Postgres
+# materializes it and paper_trades is scanned once.
+EXTREME_TRADES_SQL = "WITH" + PERIOD_TRADES_CTE + """,
+period_closed AS (
+    SELECT trade_id, market_title, sport, side, pnl::float8 as pnl, entry_time
+    FROM period_trades
+    WHERE pnl IS NOT NULL
+)
+(SELECT 'best' as bucket, * FROM period_closed ORDER BY pnl DESC LIMIT 5)
+UNION ALL
+(SELECT 'worst' as bucket, * FROM period_closed ORDER BY pnl ASC LIMIT 5)
+"""
+
+# Trades are bucketed by entry date first, so each row pays for one date cast
+# and the day-of-week expressions run once per day rather than once per trade.
+DOW_SQL = "WITH" + PERIOD_TRADES_CTE + """,
+by_date AS (
+    SELECT
+        DATE(entry_time) as d,
+        COUNT(*) as trades,
+        SUM(pnl) as pnl,
+        COUNT(*) FILTER (WHERE outcome = 'win') as wins,
+        COUNT(*) FILTER (WHERE outcome IN ('win', 'loss')) as decided
+    FROM period_trades
+    GROUP BY DATE(entry_time)
+)
+SELECT
+    EXTRACT(DOW FROM d) as dow,
+    TO_CHAR(d, 'Dy') as day_name,
+    SUM(trades)::bigint as trades,
+    COALESCE(SUM(pnl), 0)::float8 as pnl,
+    COALESCE(100.0 * SUM(wins) / NULLIF(SUM(decided), 0), 0)::float8 as win_rate
+FROM by_date
+GROUP BY EXTRACT(DOW FROM d), TO_CHAR(d, 'Dy')
+ORDER BY dow
+"""
+
+# Row templates for the report sections
+DAY_LINE = "{} ({:%a})  {:>5}  {:>5}  ${:>10,.2f}  ${:>+10.2f}  {:>8.1f}%"
+SPORT_LINE = "  {:5} {:4} trades  ${:>10,.2f} vol  ${:>+10.2f} pnl  {:6.1f}% WR"
+TRADE_LINE = "  {:%m/%d} {:5} {:4} ${:>+8.2f}  {}"
+DOW_LINE = "  {:3}  {:4} trades  ${:>+10.2f} pnl  {:6.1f}% WR"
+
 
 async def multi_day_report(end_date: date, days: int = 3):
     pool = await get_pool()
@@ -18,11 +150,24 @@ async def multi_day_report(end_date: date, days: int = 3):
     print(f'MULTI-DAY TRADING REPORT: {start_date} to {end_date} ({days} days)')
     print('='*80)
 
+    # Every section's query depends only on the date range; run them concurrently
+    daily_rows, summary, sports, extremes, dow_stats = await asyncio.gather(
+        pool.fetch(DAILY_SQL, start_date, end_date),
+        pool.fetchrow(SUMMARY_SQL, start_date, end_date),
+        pool.fetch(SPORTS_SQL, start_date, end_date),
+        pool.fetch(EXTREME_TRADES_SQL, start_date, end_date),
+        pool.fetch(DOW_SQL, start_date, end_date),
+    )
+
+    # Build the report in memory and write it once
+    lines = []
+    out = lines.append
+
     # Daily breakdown
-    print('\nDAILY BREAKDOWN:')
-    print('-'*80)
-    print(f'{"Date":<12} {"Trades":>7} {"Games":>6} {"Volume":>12} {"PnL":>12} {"Win Rate":>10}')
-    print('-'*80)
+    out('\nDAILY BREAKDOWN:')
+    out('-'*80)
+    out(f'{"Date":<12} {"Trades":>7} {"Games":>6} {"Volume":>12} {"PnL":>12} {"Win Rate":>10}')
+    out('-'*80)
 
     total_trades = 0
     total_volume = 0.0
@@ -30,154 +175,75 @@ async def multi_day_report(end_date: date, days: int = 3):
     total_wins = 0
     total_losses = 0
 
+    by_day = {r['d']: r for r in daily_rows}
+    empty_day = {
+        'trades': 0, 'games': 0, 'volume': 0.0, 'pnl': 0.0,
+        'wins': 0, 'losses': 0, 'win_rate': 0.0,
+    }
+
     for i in range(days):
         d = start_date + timedelta(days=i)
-        row = await pool.fetchrow("""
-            SELECT
-                COUNT(*) as trades,
-                COUNT(DISTINCT game_id) as games,
-                COALESCE(SUM(size), 0) as volume,
-                COALESCE(SUM(pnl), 0) as pnl,
-                SUM(CASE WHEN outcome = 'win' THEN 1 ELSE 0 END) as wins,
-                SUM(CASE WHEN outcome = 'loss' THEN 1 ELSE 0 END) as losses
-            FROM paper_trades
-            WHERE DATE(entry_time) = $1 OR DATE(exit_time) = $1
-        """, d)
-
-        wins = row['wins'] or 0
-        losses = row['losses'] or 0
-        total_closed = wins + losses
-        wr = (wins / total_closed * 100) if total_closed > 0 else 0
+        row = by_day.get(d, empty_day)
 
         total_trades += row['trades']
-        total_volume += float(row['volume'])
-        total_pnl += float(row['pnl'])
-        total_wins += wins
-        total_losses += losses
+        total_volume += row['volume']
+        total_pnl += row['pnl']
+        total_wins += row['wins']
+        total_losses += row['losses']
 
-        day_name = d.strftime('%a')
-        print(f'{d} ({day_name})  {row["trades"]:>5}  {row["games"]:>5}  '
-              f'${float(row["volume"]):>10,.2f}  ${float(row["pnl"]):>+10.2f}  {wr:>8.1f}%')
+        out(DAY_LINE.format(
+            d, d, row['trades'], row['games'], row['volume'], row['pnl'], row['win_rate']
+        ))
 
-    print('-'*80)
+    out('-'*80)
     total_closed = total_wins + total_losses
     total_wr = (total_wins / total_closed * 100) if total_closed > 0 else 0
-    print(f'{"TOTAL":<12}  {total_trades:>5}  {"":>5}  '
-          f'${total_volume:>10,.2f}  ${total_pnl:>+10.2f}  {total_wr:>8.1f}%')
+    out(f'{"TOTAL":<12}  {total_trades:>5}  {"":>5}  '
+        f'${total_volume:>10,.2f}  ${total_pnl:>+10.2f}  {total_wr:>8.1f}%')
 
     # Overall summary
-    summary = await pool.fetchrow("""
-        SELECT
-            COUNT(*) as total_trades,
-            COUNT(DISTINCT game_id) as games,
-            SUM(size) as volume,
-            SUM(pnl) as total_pnl,
-            SUM(CASE WHEN outcome = 'win' THEN 1 ELSE 0 END) as wins,
-            SUM(CASE WHEN outcome = 'loss' THEN 1 ELSE 0 END) as losses,
-            AVG(size) as avg_size,
-            AVG(edge_at_entry) as avg_edge
-        FROM paper_trades
-        WHERE (DATE(entry_time) >= $1 AND DATE(entry_time) <= $2)
-           OR (DATE(exit_time) >= $1 AND DATE(exit_time) <= $2)
-    """, start_date, end_date)
-
-    total = (summary['wins'] or 0) + (summary['losses'] or 0)
-    wr = (summary['wins'] / total * 100) if total > 0 else 0
-
-    print(f"""
+    out(f"""
 PERIOD SUMMARY:
   Total Trades: {summary['total_trades']}
   Unique Games: {summary['games']}
-  Volume: ${float(summary['volume'] or 0):,.2f}
-  Total PnL: ${float(summary['total_pnl'] or 0):+,.2f}
-  Win Rate: {wr:.1f}% ({summary['wins']}W / {summary['losses']}L)
-  Avg Size: ${float(summary['avg_size'] or 0):.2f}
-  Avg Edge: {float(summary['avg_edge'] or 0):.2f}%
+  Volume: ${summary['volume']:,.2f}
+  Total PnL: ${summary['total_pnl']:+,.2f}
+  Win Rate: {summary['win_rate']:.1f}% ({summary['wins']}W / {summary['losses']}L)
+  Avg Size: ${summary['avg_size']:.2f}
+  Avg Edge: {summary['avg_edge']:.2f}%
 """)
 
     # By sport
-    sports = await pool.fetch("""
-        SELECT sport,
-            COUNT(*) as trades,
-            SUM(size) as volume,
-            SUM(pnl) as pnl,
-            SUM(CASE WHEN outcome = 'win' THEN 1 ELSE 0 END) as wins,
-            SUM(CASE WHEN outcome = 'loss' THEN 1 ELSE 0 END) as losses
-        FROM paper_trades
-        WHERE (DATE(entry_time) >= $1 AND DATE(entry_time) <= $2)
-           OR (DATE(exit_time) >= $1 AND DATE(exit_time) <= $2)
-        GROUP BY sport
-        ORDER BY volume DESC
-    """, start_date, end_date)
-
-    print('BY SPORT:')
-    print('-'*70)
+    out('BY SPORT:')
+    out('-'*70)
     for s in sports:
-        total = (s['wins'] or 0) + (s['losses'] or 0)
-        wr = (s['wins'] / total * 100) if total > 0 else 0
-        print(f"  {s['sport']:5} {s['trades']:4} trades  ${float(s['volume']):>10,.2f} vol  "
-              f"${float(s['pnl'] or 0):>+10.2f} pnl  {wr:6.1f}% WR")
+        out(SPORT_LINE.format(s['sport'], s['trades'], s['volume'], s['pnl'], s['win_rate']))
 
     # Best and worst trades
-    best = await pool.fetch("""
-        SELECT trade_id, market_title, sport, side, pnl, entry_time
-        FROM paper_trades
-        WHERE ((DATE(entry_time) >= $1 AND DATE(entry_time) <= $2)
-           OR (DATE(exit_time) >= $1 AND DATE(exit_time) <= $2))
-           AND pnl IS NOT NULL
-        ORDER BY pnl DESC
-        LIMIT 5
-    """, start_date, end_date)
-
-    worst = await pool.fetch("""
-        SELECT trade_id, market_title, sport, side, pnl, entry_time
-        FROM paper_trades
-        WHERE ((DATE(entry_time) >= $1 AND DATE(entry_time) <= $2)
-           OR (DATE(exit_time) >= $1 AND DATE(exit_time) <= $2))
-           AND pnl IS NOT NULL
-        ORDER BY pnl ASC
-        LIMIT 5
-    """, start_date, end_date)
-
-    print()
-    print('TOP 5 BEST TRADES:')
-    print('-'*70)
+    best = [t for t in extremes if t['bucket'] == 'best']
+    worst = [t for t in extremes if t['bucket'] == 'worst']
+
+    out('')
+    out('TOP 5 BEST TRADES:')
+    out('-'*70)
     for t in best:
-        print(f"  {t['entry_time'].strftime('%m/%d')} {t['sport']:5} {t['side']:4} "
-              f"${float(t['pnl']):>+8.2f}  {t['market_title'][:35]}")
+        out(TRADE_LINE.format(t['entry_time'], t['sport'], t['side'], t['pnl'], t['market_title'][:35]))
 
-    print()
-    print('TOP 5 WORST TRADES:')
-    print('-'*70)
+    out('')
+    out('TOP 5 WORST TRADES:')
+    out('-'*70)
     for t in worst:
-        print(f"  {t['entry_time'].strftime('%m/%d')} {t['sport']:5} {t['side']:4} "
-              f"${float(t['pnl']):>+8.2f}  {t['market_title'][:35]}")
+        out(TRADE_LINE.format(t['entry_time'], t['sport'], t['side'], t['pnl'], t['market_title'][:35]))
 
     # Win rate by day of week
-    dow_stats = await pool.fetch("""
-        SELECT
-            EXTRACT(DOW FROM entry_time) as dow,
-            TO_CHAR(entry_time, 'Dy') as day_name,
-            COUNT(*) as trades,
-            SUM(pnl) as pnl,
-            SUM(CASE WHEN outcome = 'win' THEN 1 ELSE 0 END) as wins,
-            SUM(CASE WHEN outcome = 'loss' THEN 1 ELSE 0 END) as losses
-        FROM paper_trades
-        WHERE (DATE(entry_time) >= $1 AND DATE(entry_time) <= $2)
-           OR (DATE(exit_time) >= $1 AND DATE(exit_time) <= $2)
-        GROUP BY EXTRACT(DOW FROM entry_time), TO_CHAR(entry_time, 'Dy')
-        ORDER BY dow
-    """, start_date, end_date)
-
     if dow_stats:
-        print()
-        print('BY DAY OF WEEK:')
-        print('-'*70)
+        out('')
+        out('BY DAY OF WEEK:')
+        out('-'*70)
         for d in dow_stats:
-            total = (d['wins'] or 0) + (d['losses'] or 0)
-            wr = (d['wins'] / total * 100) if total > 0 else 0
-            print(f"  {d['day_name']:3}  {d['trades']:4} trades  "
-                  f"${float(d['pnl'] or 0):>+10.2f} pnl  {wr:6.1f}% WR")
+            out(DOW_LINE.format(d['day_name'], d['trades'], d['pnl'], d['win_rate']))
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
     await close_pool()
 
@@ -16,22 +16,157 @@ Output:
 """
 
 import argparse
+import asyncio
 import csv
+import os
+import re
 import subprocess
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+STATS_FORMAT = "{{.Name}},{{.MemUsage}},{{.MemPerc}},{{.CPUPerc}}"
+
+# Streaming `docker stats` may prefix frames with terminal control sequences
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+# Flush the CSV every N samples (~1 min at the default interval); the file is
+# always flushed on close
+CSV_FLUSH_EVERY = 6
+
+DOCKER_SOCKET = "/var/run/docker.sock"
+
+# Containers not reported by the stream for this long are treated as gone
+STREAM_STALE_AFTER_S = 5.0
+
+
+def is_profiled_container(name: str, container_filter: Optional[List[str]] = None) -> bool:
+    """Whether a container should be profiled."""
+    # Filter containers if specified
+    if container_filter:
+        if not any(f in name for f in container_filter):
+            return False
+
+    # Only include arbees containers
+    return "arbees" in name.lower()
+
+
+def parse_stats_line(line: str, container_filter: Optional[List[str]] = None) -> Optional[Dict]:
+    """Parse one formatted `docker stats` line, or None if it should be skipped."""
+    parts = line.split(",")
+    if len(parts) != 4:
+        return None
+
+    name, mem_usage, mem_pct, cpu_pct = parts
+    if not is_profiled_container(name, container_filter):
+        return None
+
+    # Parse memory percentage (remove % sign)
+    try:
+        mem_pct_float = float(mem_pct.rstrip("%"))
+    except ValueError:
+        mem_pct_float = 0.0
+
+    # Parse CPU percentage
+    try:
+        cpu_pct_float = float(cpu_pct.rstrip("%"))
+    except ValueError:
+        cpu_pct_float = 0.0
+
+    return {
+        "name": name,
+        "mem_usage": mem_usage,
+        "mem_pct": mem_pct_float,
+        "cpu_pct": cpu_pct_float,
+    }
+
+
+def format_bytes(n: float) -> str:
+    """Format a byte count the way `docker stats` does (binary units)."""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if n < 1024:
+            return f"{n:.2f}{unit}" if unit != "B" else f"{int(n)}B"
+        n /= 1024
+    return f"{n:.2f}TiB"
+
+
+def stats_from_api(name: str, raw: Dict) -> Dict:
+    """Convert a Docker Engine API stats document to the `docker stats` row shape."""
+    mem = raw.get("memory_stats") or {}
+    mem_detail = mem.get("stats") or {}
+    # Same as the CLI: page cache doesn't count as used (cgroup v2, then v1 key)
+    cache = mem_detail.get("inactive_file", mem_detail.get("total_inactive_file", 0))
+    used = max(mem.get("usage", 0) - cache, 0)
+    limit = mem.get("limit") or 0
+
+    cpu = raw.get("cpu_stats") or {}
+    precpu = raw.get("precpu_stats") or {}
+    cpu_delta = (cpu.get("cpu_usage") or {}).get("total_usage", 0) - \
+        (precpu.get("cpu_usage") or {}).get("total_usage", 0)
+    system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+    online_cpus = cpu.get("online_cpus") or \
+        len((cpu.get("cpu_usage") or {}).get("percpu_usage") or []) or 1
+
+    return {
+        "name": name,
+        "mem_usage": f"{format_bytes(used)} / {format_bytes(limit)}",
+        "mem_pct": used / limit * 100 if limit else 0.0,
+        "cpu_pct": cpu_delta / system_delta * online_cpus * 100
+        if system_delta > 0 and cpu_delta > 0 else 0.0,
+    }
+
+
+async def fetch_api_stats(container_filter: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Snapshot stats from the Docker Engine API, one request per container in parallel.
+
+    Each stats request blocks ~1s for a CPU sample, so the CLI's one-shot
+    snapshot grows with the container count; concurrent requests don't.
+    """
+    connector = aiohttp.UnixConnector(path=DOCKER_SOCKET)
+    timeout = aiohttp.ClientTimeout(total=30)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        async with session.get("http://docker/containers/json") as resp:
+            resp.raise_for_status()
+            containers = await resp.json()
+
+        names = {}
+        for c in containers:
+            name = c["Names"][0].lstrip("/")
+            if is_profiled_container(name, container_filter):
+                names[c["Id"]] = name
+
+        async def fetch(container_id: str) -> Dict:
+            url = f"http://docker/containers/{container_id}/stats"
+            async with session.get(url, params={"stream": "false"}) as resp:
+                resp.raise_for_status()
+                return await resp.json()
+
+        raws = await asyncio.gather(*(fetch(cid) for cid in names))
+
+    return [stats_from_api(names[cid], raw) for cid, raw in zip(names, raws, strict=True)]
+
 
 def get_container_stats(container_filter: Optional[List[str]] = None) -> List[Dict]:
-    """Get memory stats for running containers."""
+    """Get memory stats for running containers (one-shot snapshot)."""
+    if AIOHTTP_AVAILABLE and os.path.exists(DOCKER_SOCKET):
+        try:
+            return asyncio.run(fetch_api_stats(container_filter))
+        except Exception as e:
+            print(f"Docker API error ({e}), falling back to docker CLI")
+
     try:
         # Use docker stats with --no-stream for a single snapshot
-        cmd = [
-            "docker", "stats", "--no-stream",
-            "--format", "{{.Name}},{{.MemUsage}},{{.MemPerc}},{{.CPUPerc}}"
-        ]
+        cmd = ["docker", "stats", "--no-stream", "--format", STATS_FORMAT]
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
 
         if result.returncode != 0:
@@ -43,39 +178,9 @@ def get_container_stats(container_filter: Optional[List[str]] = None) -> List[Di
             if not line:
                 continue
 
-            parts = line.split(",")
-            if len(parts) != 4:
-                continue
-
-            name, mem_usage, mem_pct, cpu_pct = parts
-
-            # Filter containers if specified
-            if container_filter:
-                if not any(f in name for f in container_filter):
-                    continue
-
-            # Only include arbees containers
-            if "arbees" not in name.lower():
-                continue
-
-            # Parse memory percentage (remove % sign)
-            try:
-                mem_pct_float = float(mem_pct.rstrip("%"))
-            except ValueError:
-                mem_pct_float = 0.0
-
-            # Parse CPU percentage
-            try:
-                cpu_pct_float = float(cpu_pct.rstrip("%"))
-            except ValueError:
-                cpu_pct_float = 0.0
-
-            stats.append({
-                "name": name,
-                "mem_usage": mem_usage,
-                "mem_pct": mem_pct_float,
-                "cpu_pct": cpu_pct_float,
-            })
+            stat = parse_stats_line(line, container_filter)
+            if stat:
+                stats.append(stat)
 
         return stats
 
@@ -87,26 +192,119 @@ def get_container_stats(container_filter: Optional[List[str]] = None) -> List[Di
         return []
 
 
-def format_stats_table(stats: List[Dict], threshold: float) -> str:
-    """Format stats as a table for display."""
-    if not stats:
-        return "No containers found"
+class DockerStatsStream:
+    """
+    Long-lived `docker stats` process read on a background thread.
+
+    Avoids paying docker CLI startup and a full API snapshot on every sample;
+    snapshot() returns the latest reading for each container still reporting.
+    """
+
+    def __init__(self, container_filter: Optional[List[str]] = None):
+        self._filter = container_filter
+        self._latest: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._proc = subprocess.Popen(
+            ["docker", "stats", "--format", STATS_FORMAT],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+    def _read(self) -> None:
+        for raw in self._proc.stdout:
+            stat = parse_stats_line(ANSI_ESCAPE.sub("", raw).strip(), self._filter)
+            if stat:
+                with self._lock:
+                    self._latest[stat["name"]] = (time.monotonic(), stat)
+                self._ready.set()
+
+    @property
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Wait for the first container reading."""
+        return self._ready.wait(timeout)
+
+    def snapshot(self) -> List[Dict]:
+        """Latest stats per container, dropping containers that stopped reporting."""
+        cutoff = time.monotonic() - STREAM_STALE_AFTER_S
+        with self._lock:
+            for name in [n for n, (seen, _) in self._latest.items() if seen < cutoff]:
+                del self._latest[name]
+            return [stat for _, stat in self._latest.values()]
+
+    def close(self) -> None:
+        if self.alive:
+            self._proc.terminate()
+            try:
+                self._proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+
+
+STATS_TABLE_HEADER = (
+    f"{'Container':<35} {'Memory':<20} {'Mem %':<10} {'CPU %':<10} {'Status':<10}\n"
+    + "-" * 95
+)
+
+
+class StatsTable:
+    """
+    Renders the per-sample stats table, reusing rows whose values haven't changed.
 
-    # Sort by memory percentage descending
-    stats = sorted(stats, key=lambda x: x["mem_pct"], reverse=True)
+    Most containers report the same numbers (or the stream hasn't produced a
+    new frame) between samples, so only changed rows are re-formatted.
+    """
 
-    lines = []
-    lines.append(f"{'Container':<35} {'Memory':<20} {'Mem %':<10} {'CPU %':<10} {'Status':<10}")
-    lines.append("-" * 95)
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self._rows: Dict[str, tuple] = {}
 
-    for stat in stats:
-        status = "⚠️ HIGH" if stat["mem_pct"] > threshold else "OK"
-        lines.append(
+    def _row(self, stat: Dict) -> str:
+        key = (stat["mem_usage"], stat["mem_pct"], stat["cpu_pct"])
+        cached = self._rows.get(stat["name"])
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        status = "⚠️ HIGH" if stat["mem_pct"] > self.threshold else "OK"
+        line = (
             f"{stat['name']:<35} {stat['mem_usage']:<20} {stat['mem_pct']:<10.1f} "
             f"{stat['cpu_pct']:<10.1f} {status:<10}"
         )
+        self._rows[stat["name"]] = (key, line)
+        return line
+
+    def render(self, stats: List[Dict]) -> str:
+        """Format stats as a table for display."""
+        if not stats:
+            return "No containers found"
+
+        # Forget containers that are gone
+        if len(self._rows) > len(stats):
+            current = {stat["name"] for stat in stats}
+            for name in [n for n in self._rows if n not in current]:
+                del self._rows[name]
 
-    return "\n".join(lines)
+        # Sort by memory percentage descending
+        ordered = sorted(stats, key=lambda x: x["mem_pct"], reverse=True)
+        return "\n".join([STATS_TABLE_HEADER] + [self._row(stat) for stat in ordered])
+
+
+def reap_writes(futures: List[Future]) -> List[Future]:
+    """Surface any failed CSV write and return the writes still pending."""
+    pending = []
+    for fut in futures:
+        if fut.done():
+            fut.result()
+        else:
+            pending.append(fut)
+    return pending
 
 
 def main():
@@ -154,45 +352,78 @@ def main():
 
     start_time = time.time()
     samples = 0
+    samples_since_flush = 0
     high_memory_events = []
 
-    with open(csv_path, "w", newline="") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow(["timestamp", "container", "mem_usage", "mem_pct", "cpu_pct"])
-
-        while time.time() - start_time < args.duration:
-            now = datetime.now()
-            stats = get_container_stats(args.containers)
-
-            if stats:
-                samples += 1
-
-                # Write to CSV
-                for stat in stats:
-                    writer.writerow([
-                        now.isoformat(),
-                        stat["name"],
-                        stat["mem_usage"],
-                        stat["mem_pct"],
-                        stat["cpu_pct"],
-                    ])
-
-                # Check for high memory
-                for stat in stats:
-                    if stat["mem_pct"] > args.threshold:
-                        event = f"{now.isoformat()} - {stat['name']}: {stat['mem_pct']:.1f}%"
-                        high_memory_events.append(event)
-                        print(f"⚠️  HIGH MEMORY: {stat['name']} at {stat['mem_pct']:.1f}%")
-
-                # Display table
-                if not args.quiet:
-                    # Clear screen and show stats
-                    print(f"\n[{now.strftime('%H:%M:%S')}] Sample {samples}")
-                    print(format_stats_table(stats, args.threshold))
-
-                csvfile.flush()
-
-            time.sleep(args.interval)
+    table = StatsTable(args.threshold)
+    try:
+        stream: Optional[DockerStatsStream] = DockerStatsStream(args.containers)
+        stream.wait_ready(timeout=min(args.interval, 5))
+    except OSError as e:
+        print(f"⚠️  Could not start docker stats stream ({e}); using one-shot snapshots")
+        stream = None
+
+    # A single worker keeps writes ordered while disk latency stays off the
+    # sampling loop
+    csv_io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="csv-writer")
+    pending_writes: List[Future] = []
+
+    try:
+        with open(csv_path, "w", newline="") as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["timestamp", "container", "mem_usage", "mem_pct", "cpu_pct"])
+
+            try:
+                while time.time() - start_time < args.duration:
+                    now = datetime.now()
+                    # Without a live stream (docker restarted?), fall back to one-shot snapshots
+                    stats = (
+                        stream.snapshot()
+                        if stream is not None and stream.alive
+                        else get_container_stats(args.containers)
+                    )
+
+                    if stats:
+                        samples += 1
+
+                        # Write to CSV (one batch per sample, off the sampling thread)
+                        ts = now.isoformat()
+                        pending_writes.append(csv_io.submit(writer.writerows, [
+                            [ts, s["name"], s["mem_usage"], s["mem_pct"], s["cpu_pct"]]
+                            for s in stats
+                        ]))
+
+                        # Check for high memory
+                        for stat in stats:
+                            if stat["mem_pct"] > args.threshold:
+                                name, pct = stat["name"], stat["mem_pct"]
+                                high_memory_events.append(f"{ts} - {name}: {pct:.1f}%")
+                                print(f"⚠️  HIGH MEMORY: {name} at {pct:.1f}%")
+
+                        # Display table
+                        if not args.quiet:
+                            # Clear screen and show stats
+                            print(f"\n[{now.strftime('%H:%M:%S')}] Sample {samples}")
+                            print(table.render(stats))
+
+                        samples_since_flush += 1
+                        if samples_since_flush >= CSV_FLUSH_EVERY:
+                            pending_writes.append(csv_io.submit(csvfile.flush))
+                            samples_since_flush = 0
+
+                        pending_writes = reap_writes(pending_writes)
+
+                    time.sleep(args.interval)
+            finally:
+                # Drain queued writes before the file closes, even on Ctrl+C
+                csv_io.shutdown(wait=True)
+
+            # Surface any write error
+            for fut in pending_writes:
+                fut.result()
+    finally:
+        if stream is not None:
+            stream.close()
 
     # Summary
     print("\n" + "=" * 50)
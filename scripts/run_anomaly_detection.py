@@ -2,40 +2,44 @@
 """Run anomaly detection on today's data (non-destructive)."""
 
 import asyncio
-from datetime import date
+from datetime import date, timedelta
 from dotenv import load_dotenv
 load_dotenv()
 
-from arbees_shared.db.connection import get_pool, close_pool
+from arbees_shared.db.connection import close_pool, transaction
 from services.ml_analyzer.anomaly_detector import AnomalyDetector
 
 
 async def main():
-    pool = await get_pool()
     today = date.today()
 
     print(f"ANOMALY DETECTION FOR {today}")
     print("="*80)
 
-    # Get all trades for today
-    trades = await pool.fetch("""
-        SELECT * FROM paper_trades
-        WHERE DATE(entry_time) = $1 OR DATE(exit_time) = $1
-        ORDER BY entry_time
-    """, today)
+    # Stream today's trades through the detector; only per-game aggregates
+    # are kept in memory (asyncpg cursors require a transaction)
+    detector = AnomalyDetector()
+    trade_count = 0
+    async with transaction() as conn:
+        async for trade in conn.cursor("""
+            SELECT trade_id, game_id, market_title, side, status, outcome,
+                   entry_price, exit_price, size, pnl, entry_time
+            FROM paper_trades
+            WHERE (entry_time >= $1::date AND entry_time < $2::date)
+               OR (exit_time >= $1::date AND exit_time < $2::date)
+            ORDER BY entry_time
+        """, today, today + timedelta(days=1)):
+            detector.consume(trade)
+            trade_count += 1
 
-    if not trades:
+    if not trade_count:
         print("No trades found for today.")
         await close_pool()
         return
 
-    # Convert to list of dicts
-    trade_list = [dict(t) for t in trades]
-    print(f"Analyzing {len(trade_list)} trades...")
+    print(f"Analyzing {trade_count} trades...")
 
-    # Run anomaly detection
-    detector = AnomalyDetector()
-    report = detector.analyze(trade_list, today)
+    report = detector.finalize(today)
 
     # Print results
     print(detector.format_report(report))
@@ -12,9 +12,30 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 
 from services.ml_analyzer.analyzer import MLAnalyzer
 
+# Days analyzed at once (each run holds pool connections)
+MAX_CONCURRENT_DAYS = 4
+
+
+async def share_history(analyzer: MLAnalyzer) -> None:
+    """Load the ML training history once and hand the same rows to every day.
+
+    The lookback window ends today, not on the analyzed day, so each
+    concurrent day would otherwise run the same (largest) query.
+    """
+    history = await analyzer.data_loader.load_historical_trades(
+        days=analyzer.config.lookback_days
+    )
+
+    async def load_shared(days: int = 30, min_trades: int = 0) -> list[dict]:
+        return history
+
+    analyzer.data_loader.load_historical_trades = load_shared
+
 
 async def run_hotwash_multi(end_date: date, days: int):
     """Run the hot wash analysis for multiple days."""
+    from arbees_shared.db.connection import close_pool, get_pool
+
     analyzer = MLAnalyzer()
 
     print(f"\n{'='*80}")
@@ -25,21 +46,40 @@ async def run_hotwash_multi(end_date: date, days: int):
     total_pnl = 0.0
     results = []
 
-    for i in range(days):
-        target = end_date - timedelta(days=days - 1 - i)
-        print(f"\n--- Processing {target} ---")
-
-        try:
-            insights = await analyzer.run_nightly_analysis(target)
-            trades = insights.total_trades
-            pnl = insights.total_pnl
-            total_trades += trades
-            total_pnl += pnl
-            results.append((target, trades, pnl, insights.win_rate))
-            print(f"    Completed: {trades} trades, ${pnl:+.2f} P&L, {insights.win_rate:.1f}% WR")
-        except Exception as e:
-            print(f"    Error: {e}")
+    dates = [end_date - timedelta(days=days - 1 - i) for i in range(days)]
+    sem = asyncio.Semaphore(MAX_CONCURRENT_DAYS)
+
+    async def run_day(target: date):
+        # Failures are contained per day so one bad day doesn't cancel the rest
+        async with sem:
+            print(f"\n--- Processing {target} ---")
+            try:
+                insights = await analyzer.run_nightly_analysis(target)
+            except Exception as e:
+                print(f"    {target} error: {e}")
+                return target, None
+            print(f"    {target} completed: {insights.total_trades} trades, "
+                  f"${insights.total_pnl:+.2f} P&L, {insights.win_rate:.1f}% WR")
+            return target, insights
+
+    # Create the shared pool up front: get_pool() isn't guarded against
+    # concurrent first calls, so racing days would each create (and leak) one
+    await get_pool()
+    try:
+        await share_history(analyzer)
+
+        # Days are independent and mostly DB-bound; gather keeps them in date order
+        day_results = await asyncio.gather(*(run_day(d) for d in dates))
+    finally:
+        await close_pool()
+
+    for target, insights in day_results:
+        if insights is None:
             results.append((target, 0, 0, 0))
+            continue
+        total_trades += insights.total_trades
+        total_pnl += insights.total_pnl
+        results.append((target, insights.total_trades, insights.total_pnl, insights.win_rate))
 
     # Summary
     print(f"\n{'='*80}")
@@ -12,9 +12,30 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 
 from services.ml_analyzer.analyzer import MLAnalyzer
 
+# Days analyzed at once (each run holds pool connections)
+MAX_CONCURRENT_DAYS = 4
+
+
+async def share_history(analyzer: MLAnalyzer) -> None:
+    """Load the ML training history once and hand the same rows to every day.
+
+    The lookback window ends today, not on the analyzed day, so each
+    concurrent day would otherwise run the same (largest) query.
+    """
+    history = await analyzer.data_loader.load_historical_trades(
+        days=analyzer.config.lookback_days
+    )
+
+    async def load_shared(days: int = 30, min_trades: int = 0) -> list[dict]:
+        return history
+
+    analyzer.data_loader.load_historical_trades = load_shared
+
 
 async def run_hotwash_weekly(end_date: date):
     """Run the hot wash analysis for a full week."""
+    from arbees_shared.db.connection import close_pool, get_pool
+
     analyzer = MLAnalyzer()
     start_date = end_date - timedelta(days=6)
 
@@ -29,37 +50,55 @@ async def run_hotwash_weekly(end_date: date):
     results = []
     sport_totals = {}
 
-    for i in range(7):
-        target = start_date + timedelta(days=i)
+    dates = [start_date + timedelta(days=i) for i in range(7)]
+    sem = asyncio.Semaphore(MAX_CONCURRENT_DAYS)
+
+    async def run_day(target: date):
+        # Failures are contained per day so one bad day doesn't cancel the rest
+        async with sem:
+            print(f"\n--- Processing {target} ({target.strftime('%a')}) ---")
+            try:
+                insights = await analyzer.run_nightly_analysis(target)
+            except Exception as e:
+                print(f"    {target} error: {e}")
+                return target, None
+            print(f"    {target} completed: {insights.total_trades} trades, "
+                  f"${insights.total_pnl:+.2f} P&L, {insights.win_rate:.1f}% WR")
+            return target, insights
+
+    # Create the shared pool up front: get_pool() isn't guarded against
+    # concurrent first calls, so racing days would each create (and leak) one
+    await get_pool()
+    try:
+        await share_history(analyzer)
+
+        # Days are independent and mostly DB-bound; gather keeps them in date order
+        day_results = await asyncio.gather(*(run_day(d) for d in dates))
+    finally:
+        await close_pool()
+
+    for target, insights in day_results:
         day_name = target.strftime('%a')
-        print(f"\n--- Processing {target} ({day_name}) ---")
-
-        try:
-            insights = await analyzer.run_nightly_analysis(target)
-            trades = insights.total_trades
-            pnl = insights.total_pnl
-            wins = insights.winning_trades
-            losses = insights.losing_trades
-
-            total_trades += trades
-            total_pnl += pnl
-            total_wins += wins
-            total_losses += losses
-            results.append((target, day_name, trades, pnl, insights.win_rate))
-
-            # Aggregate sport data
-            for sport, data in insights.by_sport.items():
-                if sport not in sport_totals:
-                    sport_totals[sport] = {'trades': 0, 'pnl': 0, 'wins': 0, 'losses': 0}
-                sport_totals[sport]['trades'] += data.get('trades', 0)
-                sport_totals[sport]['pnl'] += data.get('pnl', 0)
-                sport_totals[sport]['wins'] += data.get('wins', 0)
-                sport_totals[sport]['losses'] += data.get('losses', 0)
-
-            print(f"    Completed: {trades} trades, ${pnl:+.2f} P&L, {insights.win_rate:.1f}% WR")
-        except Exception as e:
-            print(f"    Error: {e}")
+        if insights is None:
             results.append((target, day_name, 0, 0, 0))
+            continue
+
+        trades = insights.total_trades
+        pnl = insights.total_pnl
+        total_trades += trades
+        total_pnl += pnl
+        total_wins += insights.winning_trades
+        total_losses += insights.losing_trades
+        results.append((target, day_name, trades, pnl, insights.win_rate))
+
+        # Aggregate sport data
+        for sport, data in insights.by_sport.items():
+            if sport not in sport_totals:
+                sport_totals[sport] = {'trades': 0, 'pnl': 0, 'wins': 0, 'losses': 0}
+            sport_totals[sport]['trades'] += data.get('trades', 0)
+            sport_totals[sport]['pnl'] += data.get('pnl', 0)
+            sport_totals[sport]['wins'] += data.get('wins', 0)
+            sport_totals[sport]['losses'] += data.get('losses', 0)
 
     # Summary
     print(f"\n{'='*80}")
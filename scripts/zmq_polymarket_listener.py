@@ -7,6 +7,7 @@ Connects to the RPi ZMQ publisher and optionally bridges messages to Redis.
 Usage:
     python scripts/zmq_polymarket_listener.py --address tcp://192.168.1.100:5555 --verbose
     python scripts/zmq_polymarket_listener.py --address tcp://192.168.1.100:5555 --redis
+    python scripts/zmq_polymarket_listener.py --address tcp://localhost:5556 --topic prices.poly.
 """
 
 import argparse
@@ -55,8 +56,11 @@ class ZMQPolymarketListener:
         enable_redis: bool = False,
         redis_url: Optional[str] = None,
         verbose: bool = False,
+        topics: Optional[list[str]] = None,
     ):
         self.zmq_address = zmq_address
+        # Topic prefixes are matched inside libzmq, so unwanted frames never reach Python
+        self.topics = topics or [""]
         self.enable_redis = enable_redis
         self.redis_url = redis_url or os.environ.get("REDIS_URL", "redis://localhost:6379")
         self.verbose = verbose
@@ -83,7 +87,8 @@ class ZMQPolymarketListener:
         self._context = zmq.asyncio.Context()
         self._socket = self._context.socket(zmq.SUB)
         self._socket.connect(self.zmq_address)
-        self._socket.setsockopt_string(zmq.SUBSCRIBE, "")  # Subscribe to all
+        for topic in self.topics:
+            self._socket.setsockopt_string(zmq.SUBSCRIBE, topic)  # "" subscribes to all
 
         # Set socket options
         self._socket.setsockopt(zmq.RCVTIMEO, 5000)  # 5 second timeout
@@ -121,9 +126,10 @@ class ZMQPolymarketListener:
         """Main message receiving loop."""
         while self._running:
             try:
-                # Receive with timeout
-                message_bytes = await self._socket.recv()
-                await self._handle_message(message_bytes)
+                # Receive with timeout. Monitors publish [topic, envelope];
+                # the RPi publisher sends a single JSON frame.
+                frames = await self._socket.recv_multipart()
+                await self._handle_message(frames[-1])
 
             except zmq.Again:
                 # Timeout, continue
@@ -160,6 +166,9 @@ class ZMQPolymarketListener:
 
         if msg_type == "polymarket_prices":
             await self._handle_prices(data)
+        elif "payload" in data:
+            # Per-price envelope from an in-cluster monitor
+            await self._handle_price(data["payload"])
         elif msg_type == "heartbeat":
             logger.debug(f"Heartbeat from {source}")
         else:
@@ -171,21 +180,25 @@ class ZMQPolymarketListener:
         logger.info(f"Received {len(prices)} price updates")
 
         for price_data in prices:
-            self._prices_processed += 1
+            await self._handle_price(price_data)
 
-            market_id = price_data.get("market_id", "")
-            yes_bid = price_data.get("yes_bid", 0)
-            yes_ask = price_data.get("yes_ask", 0)
-            title = price_data.get("market_title", "")[:50]
+    async def _handle_price(self, price_data: dict) -> None:
+        """Handle a single price update."""
+        self._prices_processed += 1
 
-            if self.verbose:
-                logger.info(
-                    f"  {market_id[:12]}... | bid={yes_bid:.3f} ask={yes_ask:.3f} | {title}"
-                )
+        market_id = price_data.get("market_id", "")
+        yes_bid = price_data.get("yes_bid", 0)
+        yes_ask = price_data.get("yes_ask", 0)
+        title = (price_data.get("market_title") or "")[:50]
+
+        if self.verbose:
+            logger.info(
+                f"  {market_id[:12]}... | bid={yes_bid:.3f} ask={yes_ask:.3f} | {title}"
+            )
 
-            # Bridge to Redis if enabled
-            if self._redis_bus and REDIS_AVAILABLE:
-                await self._publish_to_redis(price_data)
+        # Bridge to Redis if enabled
+        if self._redis_bus and REDIS_AVAILABLE:
+            await self._publish_to_redis(price_data)
 
     async def _publish_to_redis(self, price_data: dict) -> None:
         """Publish price to Redis channel."""
@@ -242,6 +255,12 @@ async def main():
         default=os.environ.get("REDIS_URL", "redis://localhost:6379"),
         help="Redis URL for bridge mode",
     )
+    parser.add_argument(
+        "--topic",
+        action="append",
+        default=[],
+        help="Topic prefix to subscribe to, e.g. prices.poly. (repeatable; default: all)",
+    )
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -257,6 +276,7 @@ async def main():
         enable_redis=args.redis,
         redis_url=args.redis_url,
         verbose=args.verbose,
+        topics=args.topic,
     )
 
     # Setup signal handlers
@@ -10,7 +10,8 @@ Detects issues like:
 
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
-from typing import Optional
+from operator import itemgetter
+from typing import Iterable, Mapping, Optional
 import logging
 import statistics
 
@@ -50,6 +51,16 @@ class Anomaly:
     details: dict = field(default_factory=dict)
 
 
+@dataclass
+class _GameTally:
+    """Running per-game aggregates collected while consuming trades."""
+    market_title: Optional[str]
+    trade_count: int = 0
+    total_pnl: float = 0.0
+    total_volume: float = 0.0
+    timed_sizes: list[tuple] = field(default_factory=list)
+
+
 class AnomalyDetector:
     """
     Detects anomalies in trading data that indicate bugs or issues.
@@ -83,10 +94,11 @@ class AnomalyDetector:
         self.max_position_growth = max_position_growth
         self.max_single_game_pnl_pct = max_single_game_pnl_pct
         self.max_daily_growth_pct = max_daily_growth_pct
+        self._reset()
 
     def analyze(
         self,
-        trades: list[dict],
+        trades: Iterable[Mapping],
         for_date: date,
         starting_bankroll: Optional[float] = None,
         ending_bankroll: Optional[float] = None,
@@ -95,7 +107,64 @@ class AnomalyDetector:
         Analyze trades for anomalies.
 
         Args:
-            trades: List of trade dictionaries from database
+            trades: Trade rows from database (dicts or asyncpg Records)
+            for_date: Date being analyzed
+            starting_bankroll: Bankroll at start of day (optional)
+            ending_bankroll: Bankroll at end of day (optional)
+
+        Returns:
+            AnomalyReport with detected issues
+        """
+        self._reset()
+        for t in trades:
+            self.consume(t)
+        return self.finalize(for_date, starting_bankroll, ending_bankroll)
+
+    def consume(self, trade: Mapping) -> None:
+        """
+        Feed a single trade row into the detector.
+
+        Only per-game aggregates are kept, so rows can be streamed from a
+        database cursor without materializing the whole day. Call
+        finalize() once all rows have been consumed.
+        """
+        self._trade_count += 1
+
+        game_id = trade.get("game_id")
+        tally = self._games.get(game_id)
+        if tally is None:
+            tally = self._games[game_id] = _GameTally(
+                market_title=trade.get("market_title", "Unknown")
+            )
+
+        pnl = float(trade.get("pnl") or 0)
+        size = float(trade.get("size") or 0)
+        tally.trade_count += 1
+        tally.total_pnl += pnl
+        tally.total_volume += size
+        tally.timed_sizes.append((
+            trade.get("entry_time") or trade.get("opened_at") or datetime.min,
+            size,
+        ))
+        self._total_pnl += pnl
+
+        if trade.get("status") == "closed":
+            self._closed_count += 1
+            if trade.get("outcome") == "win":
+                self._win_count += 1
+
+        self._check_unrealistic_pnl(trade, self._pnl_anomalies)
+
+    def finalize(
+        self,
+        for_date: date,
+        starting_bankroll: Optional[float] = None,
+        ending_bankroll: Optional[float] = None,
+    ) -> AnomalyReport:
+        """
+        Build the report for everything consumed so far and reset the detector.
+
+        Args:
             for_date: Date being analyzed
             starting_bankroll: Bankroll at start of day (optional)
             ending_bankroll: Bankroll at end of day (optional)
@@ -105,20 +174,23 @@ class AnomalyDetector:
         """
         report = AnomalyReport(analysis_date=for_date)
 
-        if not trades:
+        if not self._trade_count:
+            self._reset()
             return report
 
         # Run all anomaly checks
-        self._check_game_trade_overflow(trades, report)
-        self._check_position_size_explosion(trades, report)
-        self._check_unrealistic_pnl(trades, report)
-        self._check_suspicious_win_rate(trades, report)
+        self._check_game_trade_overflow(report)
+        self._check_position_size_explosion(report)
+        report.anomalies.extend(self._pnl_anomalies)
+        self._check_suspicious_win_rate(report)
 
         if starting_bankroll and ending_bankroll:
             self._check_bankroll_growth(
-                trades, starting_bankroll, ending_bankroll, report
+                starting_bankroll, ending_bankroll, report
             )
 
+        self._reset()
+
         # Log summary
         if report.has_critical:
             logger.warning(
@@ -132,65 +204,46 @@ class AnomalyDetector:
 
         return report
 
-    def _check_game_trade_overflow(
-        self, trades: list[dict], report: AnomalyReport
-    ) -> None:
-        """Check for games with too many trades."""
-        # Group by game
-        games: dict[str, list[dict]] = {}
-        for t in trades:
-            game_id = t.get("game_id")
-            if game_id not in games:
-                games[game_id] = []
-            games[game_id].append(t)
-
-        for game_id, game_trades in games.items():
-            if len(game_trades) > self.max_trades_per_game:
-                total_pnl = sum(float(t.get("pnl") or 0) for t in game_trades)
-                total_volume = sum(float(t.get("size") or 0) for t in game_trades)
-
-                market_title = game_trades[0].get("market_title", "Unknown")
+    def _reset(self) -> None:
+        """Clear accumulated streaming state."""
+        self._games: dict[str, _GameTally] = {}
+        self._pnl_anomalies: list[Anomaly] = []
+        self._trade_count = 0
+        self._closed_count = 0
+        self._win_count = 0
+        self._total_pnl = 0.0
 
+    def _check_game_trade_overflow(self, report: AnomalyReport) -> None:
+        """Check for games with too many trades."""
+        for game_id, tally in self._games.items():
+            if tally.trade_count > self.max_trades_per_game:
                 report.anomalies.append(Anomaly(
                     anomaly_type="game_trade_overflow",
-                    severity="critical" if len(game_trades) > self.max_trades_per_game * 2 else "warning",
+                    severity="critical" if tally.trade_count > self.max_trades_per_game * 2 else "warning",
                     title=f"Too many trades on game {game_id[:8]}",
                     description=(
-                        f"{len(game_trades)} trades on single game (max {self.max_trades_per_game}). "
-                        f"Total volume: ${total_volume:,.2f}, PnL: ${total_pnl:,.2f}"
+                        f"{tally.trade_count} trades on single game (max {self.max_trades_per_game}). "
+                        f"Total volume: ${tally.total_volume:,.2f}, PnL: ${tally.total_pnl:,.2f}"
                     ),
                     details={
                         "game_id": game_id,
-                        "trade_count": len(game_trades),
-                        "total_volume": total_volume,
-                        "total_pnl": total_pnl,
-                        "market_title": market_title,
+                        "trade_count": tally.trade_count,
+                        "total_volume": tally.total_volume,
+                        "total_pnl": tally.total_pnl,
+                        "market_title": tally.market_title,
                     }
                 ))
 
-    def _check_position_size_explosion(
-        self, trades: list[dict], report: AnomalyReport
-    ) -> None:
+    def _check_position_size_explosion(self, report: AnomalyReport) -> None:
         """Check for exponential position size growth within a game."""
-        # Group by game and sort by time
-        games: dict[str, list[dict]] = {}
-        for t in trades:
-            game_id = t.get("game_id")
-            if game_id not in games:
-                games[game_id] = []
-            games[game_id].append(t)
-
-        for game_id, game_trades in games.items():
-            if len(game_trades) < 2:
+        for game_id, tally in self._games.items():
+            if tally.trade_count < 2:
                 continue
 
-            # Sort by entry time
-            sorted_trades = sorted(
-                game_trades,
-                key=lambda x: x.get("entry_time") or x.get("opened_at") or datetime.min
-            )
-
-            sizes = [float(t.get("size") or 0) for t in sorted_trades]
+            # Sort by entry time (stable, so ties keep arrival order)
+            sizes = [
+                size for _, size in sorted(tally.timed_sizes, key=itemgetter(0))
+            ]
             if min(sizes) <= 0:
                 continue
 
@@ -211,67 +264,63 @@ class AnomalyDetector:
                         "min_size": min(sizes),
                         "max_size": max(sizes),
                         "growth_factor": max_growth,
-                        "trade_count": len(sorted_trades),
+                        "trade_count": len(sizes),
                         "sizes": sizes,
                     }
                 ))
 
     def _check_unrealistic_pnl(
-        self, trades: list[dict], report: AnomalyReport
+        self, t: Mapping, anomalies: list[Anomaly]
     ) -> None:
         """Check for PnL that doesn't match size and price movements."""
-        for t in trades:
-            entry = float(t.get("entry_price") or 0)
-            exit_p = float(t.get("exit_price") or 0)
-            size = float(t.get("size") or 0)
-            pnl = float(t.get("pnl") or 0)
-            side = t.get("side")
+        entry = float(t.get("entry_price") or 0)
+        exit_p = float(t.get("exit_price") or 0)
+        size = float(t.get("size") or 0)
+        pnl = float(t.get("pnl") or 0)
+        side = t.get("side")
 
-            if size <= 0 or not side:
-                continue
+        if size <= 0 or not side:
+            return
 
-            # Calculate expected PnL
-            if side == "buy":
-                expected_pnl = (exit_p - entry) * size
-            else:
-                expected_pnl = (entry - exit_p) * size
+        # Calculate expected PnL
+        if side == "buy":
+            expected_pnl = (exit_p - entry) * size
+        else:
+            expected_pnl = (entry - exit_p) * size
 
-            # Allow small difference due to slippage/fees
-            diff = abs(pnl - expected_pnl)
-            diff_pct = (diff / size * 100) if size > 0 else 0
+        # Allow small difference due to slippage/fees
+        diff = abs(pnl - expected_pnl)
+        diff_pct = (diff / size * 100) if size > 0 else 0
 
-            if diff > 1.0 and diff_pct > 1.0:  # More than $1 and >1% of size
-                report.anomalies.append(Anomaly(
-                    anomaly_type="unrealistic_pnl",
-                    severity="warning",
-                    title=f"PnL mismatch on trade {t.get('trade_id', 'unknown')[:8]}",
-                    description=(
-                        f"Recorded PnL ${pnl:.2f} doesn't match expected ${expected_pnl:.2f} "
-                        f"(diff: ${diff:.2f}, {diff_pct:.1f}%)"
-                    ),
-                    details={
-                        "trade_id": t.get("trade_id"),
-                        "entry_price": entry,
-                        "exit_price": exit_p,
-                        "size": size,
-                        "side": side,
-                        "recorded_pnl": pnl,
-                        "expected_pnl": expected_pnl,
-                        "difference": diff,
-                    }
-                ))
+        if diff > 1.0 and diff_pct > 1.0:  # More than $1 and >1% of size
+            anomalies.append(Anomaly(
+                anomaly_type="unrealistic_pnl",
+                severity="warning",
+                title=f"PnL mismatch on trade {t.get('trade_id', 'unknown')[:8]}",
+                description=(
+                    f"Recorded PnL ${pnl:.2f} doesn't match expected ${expected_pnl:.2f} "
+                    f"(diff: ${diff:.2f}, {diff_pct:.1f}%)"
+                ),
+                details={
+                    "trade_id": t.get("trade_id"),
+                    "entry_price": entry,
+                    "exit_price": exit_p,
+                    "size": size,
+                    "side": side,
+                    "recorded_pnl": pnl,
+                    "expected_pnl": expected_pnl,
+                    "difference": diff,
+                }
+            ))
 
-    def _check_suspicious_win_rate(
-        self, trades: list[dict], report: AnomalyReport
-    ) -> None:
+    def _check_suspicious_win_rate(self, report: AnomalyReport) -> None:
         """Check for unrealistically high or low win rates."""
-        closed = [t for t in trades if t.get("status") == "closed"]
-
-        if len(closed) < self.MIN_TRADES_FOR_RATE_CHECK:
+        closed = self._closed_count
+        if closed < self.MIN_TRADES_FOR_RATE_CHECK:
             return
 
-        wins = sum(1 for t in closed if t.get("outcome") == "win")
-        win_rate = wins / len(closed)
+        wins = self._win_count
+        win_rate = wins / closed
 
         if win_rate > self.SUSPICIOUS_WIN_RATE_HIGH:
             report.anomalies.append(Anomaly(
@@ -279,13 +328,13 @@ class AnomalyDetector:
                 severity="warning",
                 title="Suspiciously high win rate",
                 description=(
-                    f"Win rate of {win_rate:.1%} ({wins}/{len(closed)}) is unusually high. "
+                    f"Win rate of {win_rate:.1%} ({wins}/{closed}) is unusually high. "
                     f"This may indicate data issues or a bug in outcome determination."
                 ),
                 details={
                     "win_rate": win_rate,
                     "wins": wins,
-                    "total_trades": len(closed),
+                    "total_trades": closed,
                 }
             ))
 
@@ -295,19 +344,18 @@ class AnomalyDetector:
                 severity="warning",
                 title="Suspiciously low win rate",
                 description=(
-                    f"Win rate of {win_rate:.1%} ({wins}/{len(closed)}) is unusually low. "
+                    f"Win rate of {win_rate:.1%} ({wins}/{closed}) is unusually low. "
                     f"This may indicate a bug in trade execution or outcome determination."
                 ),
                 details={
                     "win_rate": win_rate,
                     "wins": wins,
-                    "total_trades": len(closed),
+                    "total_trades": closed,
                 }
             ))
 
     def _check_bankroll_growth(
         self,
-        trades: list[dict],
         starting_bankroll: float,
         ending_bankroll: float,
         report: AnomalyReport,
@@ -319,7 +367,7 @@ class AnomalyDetector:
         growth_pct = ((ending_bankroll - starting_bankroll) / starting_bankroll) * 100
 
         if growth_pct > self.max_daily_growth_pct:
-            total_pnl = sum(float(t.get("pnl") or 0) for t in trades)
+            total_pnl = self._total_pnl
 
             report.anomalies.append(Anomaly(
                 anomaly_type="bankroll_growth_anomaly",
@@ -18,13 +18,16 @@ Key design decisions:
 import asyncio
 import os
 import signal
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional
 
 import json
+import re
 import time
 
 import httpx
+import orjson
 from loguru import logger
 
 from arbees_shared.messaging.redis_bus import RedisBus, Channel, deserialize
@@ -36,12 +39,52 @@ from markets.polymarket.hybrid_client import HybridPolymarketClient
 # Optional ZMQ support for low-latency messaging
 try:
     import zmq
-    import zmq.asyncio
     ZMQ_AVAILABLE = True
 except ImportError:
     ZMQ_AVAILABLE = False
     logger.warning("pyzmq not installed - ZMQ publishing disabled")
 
+# Optional uvloop event loop (faster selectors/socket I/O); falls back to asyncio
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# Naive datetimes in price envelopes are UTC; serialize them as "...Z" in C
+ZMQ_JSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+
+
+# Keyword -> asset. Assets are listed in match-priority order: when a title
+# mentions several assets, the one listed first wins.
+ASSET_KEYWORDS = {
+    "BITCOIN": "BTC",
+    "BTC": "BTC",
+    "ETHEREUM": "ETH",
+    "ETH": "ETH",
+    "SOLANA": "SOL",
+    "SOL": "SOL",
+    "XRP": "XRP",
+    "RIPPLE": "XRP",
+    "DOGE": "DOGE",
+    "DOGECOIN": "DOGE",
+    "CARDANO": "ADA",
+    "ADA": "ADA",
+    "POLKADOT": "DOT",
+    "DOT": "DOT",
+    "AVALANCHE": "AVAX",
+    "AVAX": "AVAX",
+}
+_ASSET_PRIORITY = {asset: i for i, asset in enumerate(dict.fromkeys(ASSET_KEYWORDS.values()))}
+# One alternation scanned in a single pass. The zero-width lookahead tries
+# every position, so overlapping keywords are all found (e.g. "DOGETH" yields
+# both DOGE and ETH). Keywords sharing a start position map to the same asset,
+# so matching the longest one there loses nothing.
+_ASSET_ALTERNATION = "|".join(
+    re.escape(k) for k in sorted(ASSET_KEYWORDS, key=len, reverse=True)
+)
+_ASSET_RE = re.compile(f"(?=({_ASSET_ALTERNATION}))")
+
 
 def extract_asset_from_market_title(title: str) -> Optional[str]:
     """
@@ -58,33 +101,11 @@ def extract_asset_from_market_title(title: str) -> Optional[str]:
     if not title:
         return None
 
-    title_upper = title.upper()
-
-    # Direct word matching for known assets
-    asset_keywords = {
-        "BITCOIN": "BTC",
-        "BTC": "BTC",
-        "ETHEREUM": "ETH",
-        "ETH": "ETH",
-        "SOLANA": "SOL",
-        "SOL": "SOL",
-        "XRP": "XRP",
-        "RIPPLE": "XRP",
-        "DOGE": "DOGE",
-        "DOGECOIN": "DOGE",
-        "CARDANO": "ADA",
-        "ADA": "ADA",
-        "POLKADOT": "DOT",
-        "DOT": "DOT",
-        "AVALANCHE": "AVAX",
-        "AVAX": "AVAX",
-    }
-
-    for keyword, asset in asset_keywords.items():
-        if keyword in title_upper:
-            return asset
-
-    return None
+    assets = {ASSET_KEYWORDS[m.group(1)] for m in _ASSET_RE.finditer(title.upper())}
+    if not assets:
+        return None
+
+    return min(assets, key=_ASSET_PRIORITY.__getitem__)
 
 
 class PolymarketMonitor:
@@ -113,6 +134,15 @@ class PolymarketMonitor:
         # Used to store asset and title information for crypto markets
         self._market_metadata: dict[str, dict] = {}
 
+        # condition_id -> (monotonic fetch time, market, title, detected asset).
+        # A market's title/classification doesn't change, so reassignments within
+        # the TTL skip both the lookup and the keyword scan. Bounded LRU: expired
+        # entries are deleted on lookup and the least recently used is evicted
+        # past the max size.
+        self._market_cache: OrderedDict[str, tuple[float, dict, str, Optional[str]]] = OrderedDict()
+        self._market_cache_ttl_s = float(os.environ.get("POLYMARKET_MARKET_CACHE_TTL_SECONDS", "3600"))
+        self._market_cache_max = int(os.environ.get("POLYMARKET_MARKET_CACHE_SIZE", "2048"))
+
         # Active assignment per (game_id, market_type) -> condition_id
         # Used to prevent publishing stale markets after discovery corrections.
         self._active_by_game_type: dict[tuple[str, str], str] = {}
@@ -123,16 +153,38 @@ class PolymarketMonitor:
         self._last_price_time: Optional[datetime] = None
         self._prices_published = 0
         self._poll_interval_s = float(os.environ.get("POLYMARKET_POLL_INTERVAL_SECONDS", "2.0"))
+        # Bounds concurrent market lookups so the VPN link isn't oversubscribed
+        self._fetch_sem = asyncio.Semaphore(int(os.environ.get("POLYMARKET_FETCH_CONCURRENCY", "8")))
 
         # Heartbeat publisher for health monitoring
         self._heartbeat_publisher: Optional[HeartbeatPublisher] = None
+        # Health status message; only the counters and timestamp change per tick
+        self._health_status_msg = {
+            "type": "POLYMARKET_MONITOR_HEALTH",
+            "service": "polymarket_monitor",
+            "healthy": True,
+            "subscribed_markets": 0,
+            "prices_published": 0,
+            "timestamp": None,
+        }
 
         # ZMQ publisher for low-latency messaging (HOT PATH - always enabled)
         # ZMQ is the primary transport for price data; Redis is only for slow-path consumers
-        self._zmq_context: Optional["zmq.asyncio.Context"] = None
-        self._zmq_pub: Optional["zmq.asyncio.Socket"] = None
+        # Plain (non-asyncio) sockets: PUB never waits on receive, and a non-blocking
+        # send avoids the per-message poller/future that zmq.asyncio adds
+        self._zmq_context: Optional["zmq.Context"] = None
+        self._zmq_pub: Optional["zmq.Socket"] = None
         self._zmq_seq = 0
         self._zmq_pub_port = int(os.environ.get("ZMQ_PUB_PORT", "5556"))
+        # Bound per-subscriber queueing: a lagging subscriber gets fresh prices, not a backlog
+        self._zmq_sndhwm = int(os.environ.get("ZMQ_PUB_SNDHWM", "1000"))
+
+        # Optional publish coalescing (ZMQ_PUB_BATCH_LATENCY_MS=0 publishes immediately).
+        # When enabled, only the latest price per contract is kept until the batch is
+        # flushed, so book storms collapse into one envelope per contract.
+        self._zmq_batch_size = int(os.environ.get("ZMQ_PUB_BATCH_SIZE", "64"))
+        self._zmq_batch_latency_s = float(os.environ.get("ZMQ_PUB_BATCH_LATENCY_MS", "0")) / 1000.0
+        self._pending_batch: dict[tuple, tuple[bytes, dict]] = {}
 
         # Redis publishing is now optional (only for backward compatibility)
         transport_mode = os.environ.get("ZMQ_TRANSPORT_MODE", "zmq_only").lower()
@@ -187,16 +239,23 @@ class PolymarketMonitor:
             )
 
         try:
-            self._zmq_context = zmq.asyncio.Context()
+            self._zmq_context = zmq.Context()
             self._zmq_pub = self._zmq_context.socket(zmq.PUB)
+            # Socket options must be set before bind to apply to subscriber pipes
+            self._zmq_pub.setsockopt(zmq.SNDHWM, self._zmq_sndhwm)
+            # Stale prices are worthless after shutdown - don't block on flushing them
+            self._zmq_pub.setsockopt(zmq.LINGER, 0)
             self._zmq_pub.bind(f"tcp://*:{self._zmq_pub_port}")
-            logger.info(f"ZMQ PUB socket bound to port {self._zmq_pub_port} (primary hot path)")
+            logger.info(
+                f"ZMQ PUB socket bound to port {self._zmq_pub_port} "
+                f"(HWM={self._zmq_sndhwm}, primary hot path)"
+            )
         except Exception as e:
             logger.error(f"Failed to initialize ZMQ: {e}")
             raise RuntimeError(f"ZMQ initialization failed: {e}")
 
         # Setup signal handlers
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         for sig in (signal.SIGINT, signal.SIGTERM):
             try:
                 loop.add_signal_handler(sig, lambda: asyncio.create_task(self.stop()))
@@ -230,12 +289,14 @@ class PolymarketMonitor:
 
         # Run concurrent tasks
         # Note: REST poll loop removed - WebSocket streaming is primary transport
-        await asyncio.gather(
+        tasks = [
             self._assignment_listener(),
             self._price_streaming_loop(),
             self._health_check_loop(),
-            return_exceptions=True,
-        )
+        ]
+        if self._zmq_batch_latency_s > 0:
+            tasks.append(self._zmq_batch_flush_loop())
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     async def stop(self):
         """Graceful shutdown."""
@@ -248,6 +309,7 @@ class PolymarketMonitor:
 
         # Close ZMQ socket
         if self._zmq_pub:
+            self._flush_zmq_batch()
             self._zmq_pub.close()
         if self._zmq_context:
             self._zmq_context.term()
@@ -289,6 +351,7 @@ class PolymarketMonitor:
         This ensures monitors recover quickly after restart without waiting for
         new market discoveries (which can take several minutes).
         """
+        loop = asyncio.get_running_loop()
         try:
             # Request current state from orchestrator
             request_channel = "orchestrator:startup_state_request"
@@ -310,7 +373,7 @@ class PolymarketMonitor:
                 # Send startup state request as JSON string (not msgpack)
                 request_payload = {
                     "monitor_type": "polymarket",
-                    "timestamp": asyncio.get_event_loop().time(),
+                    "timestamp": loop.time(),
                 }
                 request_json = json.dumps(request_payload)
                 logger.info(f"Publishing startup state request (attempt {attempt + 1}/{max_retries}) to {request_channel}: {request_json}")
@@ -318,8 +381,8 @@ class PolymarketMonitor:
                 await self.redis._client.publish(request_channel, request_json)
 
                 # Wait for response with 5-second timeout per attempt
-                start_time = asyncio.get_event_loop().time()
-                while not responses_received and asyncio.get_event_loop().time() - start_time < 5:
+                start_time = loop.time()
+                while not responses_received and loop.time() - start_time < 5:
                     await asyncio.sleep(0.1)
 
                 if responses_received:
@@ -351,9 +414,17 @@ class PolymarketMonitor:
                             "market_type": market_type.get("type", "crypto"),
                         })
 
-                    # Process each grouped assignment immediately
-                    for event_id, assignment in assignments_by_event.items():
-                        await self._handle_assignment(assignment)
+                    # Process grouped assignments concurrently (lookups are bounded by
+                    # _fetch_sem) and handle each one as soon as its markets resolve
+                    pending = [
+                        self._handle_assignment(assignment)
+                        for assignment in assignments_by_event.values()
+                    ]
+                    for done in asyncio.as_completed(pending):
+                        try:
+                            await done
+                        except Exception as e:
+                            logger.error(f"Failed to process startup assignment: {e}")
 
                     logger.info(f"Processed {len(assignments_by_event)} grouped market assignments")
                     return  # Success, exit
@@ -401,6 +472,7 @@ class PolymarketMonitor:
 
         logger.info(f"Received assignment: game={game_id}, sport={sport}, market_type={market_type}, markets={len(markets)}")
 
+        subscriptions = []
         for market_info in markets:
             condition_id = market_info.get("condition_id")
             market_type = market_info.get("market_type", "moneyline")
@@ -411,6 +483,14 @@ class PolymarketMonitor:
             # Update active mapping even if we're already subscribed; orchestrator may be correcting IDs.
             self._active_by_game_type[(str(game_id), str(market_type))] = str(condition_id)
 
+            subscriptions.append(self._subscribe_bounded(condition_id, game_id, market_type))
+
+        # Market lookups are independent HTTP round-trips - overlap them
+        await asyncio.gather(*subscriptions)
+
+    async def _subscribe_bounded(self, condition_id: str, game_id: str, market_type: str):
+        """Subscribe to one market under the fetch semaphore, logging failures."""
+        async with self._fetch_sem:
             try:
                 await self._subscribe_to_market(condition_id, game_id, market_type)
             except Exception as e:
@@ -432,15 +512,29 @@ class PolymarketMonitor:
 
         Gracefully skips markets that don't exist on CLOB (may be Gamma-only or not yet synced).
         """
-        # Fetch market to get token IDs and metadata
-        market = await self.poly_client.get_market(condition_id)
-        if not market:
-            logger.debug(f"Market not found on CLOB (may be Gamma-only or not yet synced): {condition_id}")
-            return
+        # Fetch market to get token IDs and metadata (cached per condition_id)
+        cached = self._market_cache.get(condition_id)
+        if cached and time.monotonic() - cached[0] >= self._market_cache_ttl_s:
+            del self._market_cache[condition_id]
+            cached = None
+
+        if cached:
+            self._market_cache.move_to_end(condition_id)
+            _, market, market_title, detected_asset = cached
+        else:
+            market = await self.poly_client.get_market(condition_id)
+            if not market:
+                logger.debug(f"Market not found on CLOB (may be Gamma-only or not yet synced): {condition_id}")
+                return
 
-        # Extract market title and asset
-        market_title = market.get("question", market.get("title", ""))
-        asset = extract_asset_from_market_title(market_title) if market_type == "crypto" else None
+            # Extract market title and asset
+            market_title = market.get("question", market.get("title", ""))
+            detected_asset = extract_asset_from_market_title(market_title)
+            self._market_cache[condition_id] = (time.monotonic(), market, market_title, detected_asset)
+            if len(self._market_cache) > self._market_cache_max:
+                self._market_cache.popitem(last=False)
+
+        asset = detected_asset if market_type == "crypto" else None
 
         # Store metadata for later use
         self._market_metadata[condition_id] = {
@@ -592,7 +686,7 @@ class PolymarketMonitor:
         )
 
         # PRIMARY: Publish to ZMQ (hot path - always)
-        await self._publish_zmq_price(condition_id, game_id, normalized_price)
+        self._publish_zmq_price(condition_id, game_id, normalized_price)
 
         # SECONDARY: Optionally publish to Redis for backward compatibility
         if self._redis_publish_prices:
@@ -607,32 +701,66 @@ class PolymarketMonitor:
             f"game={game_id}"
         )
 
-    async def _publish_zmq_price(self, condition_id: str, game_id: str, price: MarketPrice):
+    def _publish_zmq_price(self, condition_id: str, game_id: str, price: MarketPrice):
         """Publish price to ZMQ PUB socket (primary hot path)."""
+        topic = f"prices.poly.{condition_id}".encode()
+        payload = {
+            "market_id": price.market_id,
+            "platform": "polymarket",
+            "asset": price.contract_team,  # Renamed: contract_team -> asset (matches crypto_shard IncomingCryptoPrice)
+            "yes_bid": price.yes_bid,
+            "yes_ask": price.yes_ask,
+            "mid_price": price.mid_price,
+            "yes_bid_size": price.yes_bid_size,
+            "yes_ask_size": price.yes_ask_size,
+            "liquidity": price.liquidity,
+            "timestamp": price.timestamp,
+        }
+
+        if self._zmq_batch_latency_s <= 0:
+            self._send_zmq_envelope(topic, payload)
+            return
+
+        # Latest state per contract wins; superseded updates are never sent
+        self._pending_batch[(topic, price.contract_team, price.market_title)] = (topic, payload)
+        if len(self._pending_batch) >= self._zmq_batch_size:
+            self._flush_zmq_batch()
+
+    def _send_zmq_envelope(self, topic: bytes, payload: dict) -> None:
+        """Wrap a price payload in the shared envelope and send it."""
         try:
-            topic = f"prices.poly.{condition_id}".encode()
             envelope = {
                 "seq": self._zmq_seq,
                 "timestamp_ms": int(time.time() * 1000),
                 "source": "polymarket_monitor",
-                "payload": {
-                    "market_id": price.market_id,
-                    "platform": "polymarket",
-                    "asset": price.contract_team,  # Renamed: contract_team -> asset (matches crypto_shard IncomingCryptoPrice)
-                    "yes_bid": price.yes_bid,
-                    "yes_ask": price.yes_ask,
-                    "mid_price": price.mid_price,
-                    "yes_bid_size": price.yes_bid_size,
-                    "yes_ask_size": price.yes_ask_size,
-                    "liquidity": price.liquidity,
-                    "timestamp": (price.timestamp.isoformat() + "Z") if price.timestamp else None,
-                },
+                "payload": payload,
             }
             self._zmq_seq += 1
-            await self._zmq_pub.send_multipart([topic, json.dumps(envelope).encode()])
+            self._zmq_pub.send_multipart(
+                [topic, orjson.dumps(envelope, option=ZMQ_JSON_OPTIONS)],
+                flags=zmq.DONTWAIT,
+            )
         except Exception as e:
             logger.warning(f"Failed to publish to ZMQ: {e}")
 
+    def _flush_zmq_batch(self) -> None:
+        """Send every coalesced price pending in the batch."""
+        if not self._pending_batch:
+            return
+        batch, self._pending_batch = self._pending_batch, {}
+        for topic, payload in batch.values():
+            self._send_zmq_envelope(topic, payload)
+
+    async def _zmq_batch_flush_loop(self) -> None:
+        """Flush coalesced prices at least every ZMQ_PUB_BATCH_LATENCY_MS."""
+        logger.info(
+            f"ZMQ publish coalescing enabled (latency={self._zmq_batch_latency_s * 1000:.0f}ms, "
+            f"batch_size={self._zmq_batch_size})"
+        )
+        while self._running:
+            await asyncio.sleep(self._zmq_batch_latency_s)
+            self._flush_zmq_batch()
+
     async def _rest_poll_loop(self) -> None:
         """
         Fallback poller to ensure we publish prices even if WS is quiet/flaky.
@@ -691,7 +819,7 @@ class PolymarketMonitor:
                                 last_trade_price=polled.last_trade_price,
                             )
                             # PRIMARY: ZMQ (always)
-                            await self._publish_zmq_price(condition_id, game_id, normalized)
+                            self._publish_zmq_price(condition_id, game_id, normalized)
                             # SECONDARY: Redis (optional)
                             if self._redis_publish_prices:
                                 await self.redis.publish_market_price(game_id, normalized)
@@ -764,7 +892,7 @@ class PolymarketMonitor:
                             last_trade_price=float(market_data.get("lastTradePrice", 0) or 0) if market_data.get("lastTradePrice") else None,
                         )
                         # PRIMARY: ZMQ (always)
-                        await self._publish_zmq_price(condition_id, game_id, normalized)
+                        self._publish_zmq_price(condition_id, game_id, normalized)
                         # SECONDARY: Redis (optional)
                         if self._redis_publish_prices:
                             await self.redis.publish_market_price(game_id, normalized)
@@ -826,14 +954,11 @@ class PolymarketMonitor:
                         self._heartbeat_publisher.set_status(ServiceStatus.UNHEALTHY)
 
                 # Publish health status
-                await self.redis.publish(Channel.SYSTEM_ALERTS.value, {
-                    "type": "POLYMARKET_MONITOR_HEALTH",
-                    "service": "polymarket_monitor",
-                    "healthy": True,
-                    "subscribed_markets": len(self.subscribed_tokens),
-                    "prices_published": self._prices_published,
-                    "timestamp": datetime.utcnow().isoformat(),
-                })
+                status_msg = self._health_status_msg
+                status_msg["subscribed_markets"] = len(self.subscribed_tokens)
+                status_msg["prices_published"] = self._prices_published
+                status_msg["timestamp"] = datetime.utcnow().isoformat()
+                await self.redis.publish(Channel.SYSTEM_ALERTS.value, status_msg)
 
             except Exception as e:
                 logger.error(f"Health check failed: {e}")
@@ -879,4 +1004,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if UVLOOP_AVAILABLE:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -36,7 +36,9 @@ async def get_pool() -> Pool:
             min_size=5,
             max_size=20,
             command_timeout=60,
-            statement_cache_size=100,
+            # Per-connection prepared statement cache: repeated query text is
+            # bound and executed without being re-parsed/re-planned
+            statement_cache_size=int(os.environ.get("DB_STATEMENT_CACHE_SIZE", "100")),
         )
     return _pool
 
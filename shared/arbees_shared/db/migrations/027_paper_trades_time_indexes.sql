@@ -0,0 +1,27 @@
+-- ============================================================================
+-- Indexes for day-window queries on paper_trades
+-- ============================================================================
+-- Reporting and cleanup scripts select a day's trades with half-open ranges
+-- (entry_time >= day AND entry_time < day + 1), optionally OR-ed with the same
+-- range on exit_time. Btree indexes on both columns let the planner
+-- range-scan (or BitmapOr) instead of scanning the whole table.
+--
+-- daily_report.py / investigate_missing_games.py aggregate a day's trades by
+-- sport and game over size, pnl, outcome and edge_at_entry. Carrying those
+-- columns in the indexes lets each range branch run as an index-only scan
+-- instead of fetching every matching heap row. Wide text columns such as
+-- market_title are deliberately left out to keep the per-chunk indexes small.
+--
+-- Note: paper_trades is a hypertable, and TimescaleDB does not support
+-- CREATE INDEX CONCURRENTLY on hypertables. On a large live table, build
+-- these during a quiet window.
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_paper_trades_entry_time
+ON paper_trades (entry_time)
+INCLUDE (exit_time, game_id, sport, size, pnl, outcome, edge_at_entry);
+
+CREATE INDEX IF NOT EXISTS idx_paper_trades_exit_time
+ON paper_trades (exit_time)
+INCLUDE (entry_time, game_id, sport, size, pnl, outcome, edge_at_entry)
+WHERE exit_time IS NOT NULL;
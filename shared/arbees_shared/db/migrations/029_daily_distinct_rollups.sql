@@ -0,0 +1,58 @@
+-- ============================================================================
+-- Daily distinct-key rollups for investigation reports
+-- ============================================================================
+-- investigate_missing_games.py counts distinct games / markets per day across
+-- game_states, trading_signals and market_prices, which hashes every raw row
+-- of each day probed. Continuous aggregates can't hold COUNT(DISTINCT), so
+-- these keep one row per (day, key) instead; a distinct count over a day's
+-- bucket then touches only as many rows as there were games or markets.
+--
+-- Real-time aggregation (materialized_only = false) keeps the current day
+-- accurate between refreshes. Buckets are UTC days.
+-- ============================================================================
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS game_states_daily_games
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+SELECT
+    time_bucket('1 day', time) AS bucket,
+    sport,
+    game_id,
+    COUNT(*) AS state_count
+FROM game_states
+GROUP BY bucket, sport, game_id;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS trading_signals_daily_games
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+SELECT
+    time_bucket('1 day', time) AS bucket,
+    game_id,
+    COUNT(*) AS signal_count
+FROM trading_signals
+GROUP BY bucket, game_id;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS market_prices_daily_markets
+WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+SELECT
+    time_bucket('1 day', time) AS bucket,
+    market_id,
+    COUNT(*) AS price_count
+FROM market_prices
+GROUP BY bucket, market_id;
+
+SELECT add_continuous_aggregate_policy('game_states_daily_games',
+    start_offset => INTERVAL '3 days',
+    end_offset => INTERVAL '1 hour',
+    schedule_interval => INTERVAL '1 hour',
+    if_not_exists => TRUE);
+
+SELECT add_continuous_aggregate_policy('trading_signals_daily_games',
+    start_offset => INTERVAL '3 days',
+    end_offset => INTERVAL '1 hour',
+    schedule_interval => INTERVAL '1 hour',
+    if_not_exists => TRUE);
+
+SELECT add_continuous_aggregate_policy('market_prices_daily_markets',
+    start_offset => INTERVAL '3 days',
+    end_offset => INTERVAL '1 hour',
+    schedule_interval => INTERVAL '1 hour',
+    if_not_exists => TRUE);
@@ -0,0 +1,165 @@
+"""
+Unit tests for AnomalyDetector.
+
+Pins analyze() output on a fixed set of trades (the expectations match the
+detector before it was reworked to stream rows via consume/finalize) and
+checks that no state leaks between runs.
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from services.ml_analyzer.anomaly_detector import AnomalyDetector
+
+FOR_DATE = date(2026, 1, 15)
+START = datetime(2026, 1, 15, 18, 0)
+
+
+def _trade(
+    n: int,
+    game_id: str,
+    size: float,
+    *,
+    minutes: int = 0,
+    side: str = "buy",
+    entry: float = 0.40,
+    exit_p: float = 0.50,
+    pnl: float | None = None,
+    outcome: str = "win",
+) -> dict:
+    """Build a closed trade row; pnl defaults to the value implied by the prices."""
+    if pnl is None:
+        pnl = (exit_p - entry) * size if side == "buy" else (entry - exit_p) * size
+    return {
+        "trade_id": f"trade-{n:04d}-xxxx",
+        "game_id": game_id,
+        "market_title": f"Market for {game_id}",
+        "side": side,
+        "entry_price": entry,
+        "exit_price": exit_p,
+        "size": size,
+        "pnl": pnl,
+        "status": "closed",
+        "outcome": outcome,
+        "entry_time": START + timedelta(minutes=minutes),
+    }
+
+
+@pytest.fixture
+def trades() -> list[dict]:
+    """One game per check: overflow + size explosion, a PnL mismatch, a high win rate."""
+    rows = []
+    # 7 trades on one game, sizes growing 8x, inserted out of time order
+    for i, (size, minutes) in enumerate([(40, 30), (10, 0), (20, 10), (80, 50),
+                                         (15, 5), (25, 20), (30, 25)]):
+        rows.append(_trade(i, "game-aaaa-1111", size, minutes=minutes))
+    # Two trades with modest growth; the second records a wrong PnL
+    rows.append(_trade(7, "game-bbbb-2222", 10, minutes=0))
+    rows.append(_trade(8, "game-bbbb-2222", 15, minutes=5, pnl=9.0))
+    # Single-trade games: mostly wins, two losses (sell side)
+    for i in range(9, 20):
+        rows.append(_trade(i, f"game-solo-{i:04d}", 10, minutes=i))
+    rows.append(_trade(20, "game-solo-0020", 10, side="sell", outcome="loss",
+                       entry=0.40, exit_p=0.50))
+    rows.append(_trade(21, "game-solo-0021", 10, side="sell", outcome="loss",
+                       entry=0.40, exit_p=0.50))
+    return rows
+
+
+def _summary(report) -> list[tuple]:
+    return [(a.anomaly_type, a.severity, a.title) for a in report.anomalies]
+
+
+EXPECTED = [
+    ("game_trade_overflow", "warning", "Too many trades on game game-aaa"),
+    ("position_size_explosion", "critical", "Position size explosion on game game-aaa"),
+    ("unrealistic_pnl", "warning", "PnL mismatch on trade trade-00"),
+    ("suspicious_win_rate", "warning", "Suspiciously high win rate"),
+    ("bankroll_growth_anomaly", "critical", "Unrealistic bankroll growth"),
+]
+
+
+class TestAnalyze:
+    """analyze() output on the fixture trades."""
+
+    def test_anomalies(self, trades: list[dict]) -> None:
+        report = AnomalyDetector().analyze(trades, FOR_DATE, 1000.0, 2500.0)
+        assert report.analysis_date == FOR_DATE
+        assert _summary(report) == EXPECTED
+        assert report.critical_count == 2
+        assert report.warning_count == 3
+
+    def test_details(self, trades: list[dict]) -> None:
+        report = AnomalyDetector().analyze(trades, FOR_DATE, 1000.0, 2500.0)
+        overflow, explosion, pnl, win_rate, bankroll = report.anomalies
+
+        assert overflow.details == {
+            "game_id": "game-aaaa-1111",
+            "trade_count": 7,
+            "total_volume": 220.0,
+            "total_pnl": pytest.approx(22.0),
+            "market_title": "Market for game-aaaa-1111",
+        }
+        # Sizes are reported in entry-time order, not arrival order
+        assert explosion.details["sizes"] == [10.0, 15.0, 20.0, 25.0, 30.0, 40.0, 80.0]
+        assert explosion.details["growth_factor"] == 8.0
+        assert pnl.details["trade_id"] == "trade-0008-xxxx"
+        assert pnl.details["expected_pnl"] == pytest.approx(1.5)
+        assert win_rate.details == {"win_rate": 20 / 22, "wins": 20, "total_trades": 22}
+        assert bankroll.details["growth_pct"] == 150.0
+        assert bankroll.details["total_pnl"] == pytest.approx(sum(t["pnl"] for t in trades))
+
+    def test_no_trades(self) -> None:
+        report = AnomalyDetector().analyze([], FOR_DATE, 1000.0, 2500.0)
+        assert report.anomalies == []
+
+    def test_bankroll_needs_both_values(self, trades: list[dict]) -> None:
+        report = AnomalyDetector().analyze(trades, FOR_DATE, 1000.0)
+        assert _summary(report) == EXPECTED[:-1]
+
+    def test_accepts_iterator(self, trades: list[dict]) -> None:
+        report = AnomalyDetector().analyze(iter(trades), FOR_DATE, 1000.0, 2500.0)
+        assert _summary(report) == EXPECTED
+
+
+class TestStreamingState:
+    """consume()/finalize() must not carry state from one run into the next."""
+
+    def test_consume_finalize_twice(self, trades: list[dict]) -> None:
+        detector = AnomalyDetector()
+        for t in trades:
+            detector.consume(t)
+        first = detector.finalize(FOR_DATE, 1000.0, 2500.0)
+
+        small = trades[7:9]
+        for t in small:
+            detector.consume(t)
+        second = detector.finalize(FOR_DATE)
+
+        assert _summary(first) == EXPECTED
+        assert _summary(second) == _summary(AnomalyDetector().analyze(small, FOR_DATE))
+        assert _summary(second) == [EXPECTED[2]]
+
+    def test_finalize_after_empty_run(self, trades: list[dict]) -> None:
+        detector = AnomalyDetector()
+        for t in trades:
+            detector.consume(t)
+        detector.finalize(FOR_DATE)
+
+        assert detector.finalize(FOR_DATE).anomalies == []
+
+    def test_analyze_discards_unfinished_consume(self, trades: list[dict]) -> None:
+        detector = AnomalyDetector()
+        for t in trades:
+            detector.consume(t)
+
+        report = detector.analyze(trades[7:9], FOR_DATE)
+        assert _summary(report) == [EXPECTED[2]]
+
+    def test_analyze_twice(self, trades: list[dict]) -> None:
+        detector = AnomalyDetector()
+        first = detector.analyze(trades, FOR_DATE, 1000.0, 2500.0)
+        second = detector.analyze(trades, FOR_DATE, 1000.0, 2500.0)
+        assert _summary(first) == _summary(second) == EXPECTED
+        assert [a.details for a in first.anomalies] == [a.details for a in second.anomalies]